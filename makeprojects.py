@@ -1,4 +1,4 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 #
 # Create projects from a json description file
@@ -12,32 +12,55 @@
 #
 
 import os
+import ntpath
 import json
 import glob
 import shutil
 import sys
 import platform
-import argparse
 import uuid
 import hashlib
 import subprocess
+import operator
+import copy
+import codecs
+from concurrent.futures import ProcessPoolExecutor,ThreadPoolExecutor
+from os import scandir
+
+#
+# Use orjson to parse the json files if it's installed.
+# A leading byte order mark is stripped before either one is called,
+# but orjson still rejects NaN, Infinity and numbers too large
+# for a double like 1e400, which json accepts
+#
+
+try:
+	import orjson
+	jsonloads = orjson.loads
+except ImportError:
+	jsonloads = json.loads
 
 #
 # Class description for a solution file to create
+# Every setting is set on the instance so a copy
+# carries all of them to a worker process
 #
 
 class SolutionData:
-	workingDir = None
-	kind = 'tool'
-	projectname = 'project'
-	ide = 'vs2010'
-	platform = 'windows'
-	configurations = ['Debug','Internal','Release']
-	finalfolder = None
-	exclude = []
-	defines = []
-	sourcefolders = ['.']
-	includefolders = []
+	def __init__(self):
+		self.workingDir = None
+		self.kind = 'tool'
+		self.projectname = 'project'
+		self.ide = 'vs2010'
+		self.platform = 'windows'
+		self.configurations = ['Debug','Internal','Release']
+		self.finalfolder = None
+		self.exclude = []
+		self.defines = []
+		self.sourcefolders = ['.']
+		self.includefolders = []
+		# Scan the source folders' subfolders too
+		self.recursive = False
 		
 #
 # When scanning for files, return each entry here
@@ -48,12 +71,18 @@ class SourceFile:
 	filename = ''
 	# Directory the file is found in
 	directory = ''
+	# Filename with windows slashes
+	winname = ''
+	# Directory part of winname, used for grouping
+	groupname = ''
 	# File type h,hpp,c,cpp,text.xcconfig,lib
 	type = 'cpp'
 	# Filename UUID used by XCode
 	uuid = ''
 	# Filetype UUID used by XCode
 	typeuuid = ''
+	# Filename without the directory used by XCode
+	basename = ''
 
 #
 # Node class for creating directory trees
@@ -66,10 +95,26 @@ class node(object):
 		self.value = value
 		self.children = children
 	def __repr__(self, level=0):
-		ret = "\t"*level+repr(self.value)+"\n"
-		for child in self.children:
-			ret += child.__repr__(level+1)
-		return ret
+		# Walk the tree with a stack and join once at the end
+		ret = []
+		stack = [(self,level)]
+		while stack:
+			entry,level = stack.pop()
+			ret.append("\t"*level+repr(entry.value)+"\n")
+			stack.extend([(child,level+1) for child in reversed(entry.children)])
+		return ''.join(ret)
+
+#
+# Most threads used to scan source folders at the same time
+#
+
+maxScanThreads = 8
+
+#
+# Buffer size for project files that are written a line at a time
+#
+
+writeBufferSize = 1048576
 
 #
 # Acceptable input files and which buckets they fall into
@@ -89,6 +134,12 @@ codeExtensions = [
 	['.hlsl','hlsl']
 	]
 
+#
+# Lookup table of the above keyed by extension
+#
+
+codeExtensionMap = dict(codeExtensions)
+
 #
 # Given a pathname, detect if the folder exists
 # If not, create it
@@ -98,6 +149,17 @@ def createfolderifneeded(foldername):
 	if not os.path.isdir(foldername):
 		os.makedirs(foldername)
 		
+#
+# Save a list of strings as a UTF-8 file in one write,
+# the bytes in header are written first as is. The file is
+# binary so the text goes out as raw UTF-8 with \n line endings
+#
+
+def savefile(pathname,output,header=b''):
+	with open(pathname,'wb') as fp:
+		fp.write(header)
+		fp.write(''.join(output).encode('utf-8'))
+
 #
 # Convert a string to a string array
 #
@@ -134,123 +196,114 @@ def converttolinuxslashes(input):
 def converttowindowsslasheswithendslash(input):
 	input = converttowindowsslashes(input)
 	if not input.endswith('\\'):
-		input.append('\\')
+		input = input + '\\'
 	return input
 		
+#
+# Lookup tables for the ide, platform and configuration codes
+#
+
+ideCodes = {
+	'xcode3':'xc3',
+	'xcode4':'xc4',
+	'xcode5':'xc5',
+	'vs2003':'vc7',
+	'vs2005':'vc8',
+	'vs2008':'vc9',
+	'vs2010':'v10',
+	'vs2012':'v11',
+	'codeblocks':'cdb',
+	'watcom':'wat'
+	}
+
+# CodeWarrior's code depends on the target platform (solution.platform)
+codewarriorCodes = {
+	'windows':'cw9',
+	'mac':'c10'
+	}
+
+platformCodes = {
+	'windows':'win',
+	'macosx':'osx',
+	'linux':'lnx',
+	'ps3':'ps3',
+	'ps4':'ps4',
+	'xbox':'xbx',
+	'xbox360':'x36',
+	'xboxone':'one',
+	'shield':'shi',
+	'ios':'ios',
+	'mac':'mac',
+	'msdos':'dos',
+	'beos':'bos',
+	'ouya':'oya'
+	}
+
+vsPlatforms = {
+	'windows':['Win32','x64'],
+	'ps3':['PS3'],
+	'ps4':['ORBIS'],
+	'xbox':['Xbox'],
+	'xbox360':['Xbox 360'],
+	'xboxone':['Xbox ONE'],
+	'shield':['Tegra-Android'],
+	'android':['Android']
+	}
+
+configurationCodes = {
+	'Debug':'dbg',
+	'Release':'rel',
+	'Internal':'int',
+	'Profile':'pro'
+	}
+
 #
 # Create the ide code from the ide type
 #
 
 def getidecode(solution):
-	idecode = None
-	if solution.ide=='xcode3':
-		idecode = 'xc3'
-	elif solution.ide=='xcode4':
-		idecode = 'xc4'
-	elif solution.ide=='xcode5':
-		idecode = 'xc5'
-	elif solution.ide=='vs2003':
-		idecode = 'vc7'
-	elif solution.ide=='vs2005':
-		idecode = 'vc8'
-	elif solution.ide=='vs2008':
-		idecode = 'vc9'
-	elif solution.ide=='vs2010':
-		idecode = 'v10'
-	elif solution.ide=='vs2012':
-		idecode = 'v11'
-	elif solution.ide=='codeblocks':
-		idecode = 'cdb'
-	elif solution.ide=='watcom':
-		idecode = 'wat'
-	elif solution.ide=='codewarrior' and solution.platform=='windows':
-		idecode = 'cw9'
-	elif solution.ide=='codewarrior' and solution.platform=='mac':
-		idecode = 'c10'
-	return idecode
+	if solution.ide=='codewarrior':
+		return codewarriorCodes.get(solution.platform)
+	return ideCodes.get(solution.ide)
 
 #
 # Create the platform code from the platform type
 #
 
 def getplatformcode(platform):
-	platformcode = None
-	if platform=='windows':
-		platformcode = 'win'
-	elif platform=='macosx':
-		platformcode = 'osx'
-	elif platform=='linux':
-		platformcode = 'lnx'
-	elif platform=='ps3':
-		platformcode = 'ps3'
-	elif platform=='ps4':
-		platformcode = 'ps4'
-	elif platform=='xbox':
-		platformcode = 'xbx'
-	elif platform=='xbox360':
-		platformcode = 'x36'
-	elif platform=='xboxone':
-		platformcode = 'one'
-	elif platform=='shield':
-		platformcode = 'shi'
-	elif platform=='ios':
-		platformcode = 'ios'
-	elif platform=='mac':
-		platformcode = 'mac'
-	elif platform=='msdos':
-		platformcode = 'dos'
-	elif platform=='beos':
-		platformcode = 'bos'
-	elif platform=='ouya':
-		platformcode = 'oya'
-	return platformcode
+	return platformCodes.get(platform)
 
 #
 # Create the platform codes from the platform type for Visual Studio
 #
 
 def getvsplatform(platform):
-	platforms = None
-	if platform=='windows':
-		platforms = ['Win32','x64']
-	elif platform=='ps3':
-		platforms = ['PS3']
-	elif platform=='ps4':
-		platforms = ['ORBIS']
-	elif platform=='xbox':
-		platforms = ['Xbox']
-	elif platform=='xbox360':
-		platforms = ['Xbox 360']
-	elif platform=='xboxone':
-		platforms = ['Xbox ONE']
-	elif platform=='shield':
-		platforms = ['Tegra-Android']
-	elif platform=='android':
-		platforms = ['Android']
-	return platforms
+	return vsPlatforms.get(platform)
 	
 #
-# Create the platform codes from the platform type for Visual Studio
+# Create the configuration code from the configuration name
 #
 
 def getconfigurationcode(configuration):
-	code = 'unk'
-	if configuration=='Debug':
-		code = 'dbg'
-	elif configuration=='Release':
-		code = 'rel'
-	elif configuration=='Internal':
-		code = 'int'
-	elif configuration=='Profile':
-		code = 'pro'
-	return code
+	return configurationCodes.get(configuration,'unk')
 
 #
 # Given a base directory and a relative directory
-# for all the files that are to be included in the project
+# scan for all the files that are to be included in the project
+# and return the list of files found along with whether
+# the directory contributed any files at all
+#
+# excludes is a set of lower case filenames to skip
+#
+# If the solution is recursive, all the folders inside
+# the directory are scanned as well
 #
 
-def scandirectory(solution,directory,codefiles):
+def scandirectory(solution,directory,excludes):
+	codefiles = []
+	# Folders that had files in them, for the include list
+	contributed = []
+	rootdirectory = directory
 
 	#
 	# Is this a valid directory?
@@ -259,58 +312,88 @@ def scandirectory(solution,directory,codefiles):
 	if os.path.isdir(searchDir):
 
 		#
-		# Scan the directory
+		# Folders left to scan, walked with a stack
+		# so deep trees don't recurse
 		#
+		
+		folders = [(directory,searchDir)]
+		while folders:
+			directory,searchDir = folders.pop()
 
-		nameList = os.listdir(searchDir)
-		for baseName in nameList:
+			#
+			# If the directory is the root, then don't prepend a directory
+			#
+			if directory=='.':
+				prefix = ''
+			else:
+				prefix = directory + os.sep
+			filecount = len(codefiles)
 
 			#
-			# Is this file in the exclusion list?
+			# Scan the directory
 			#
 
-			testName = baseName.lower()
-			skip = False
-			for exclude in solution.exclude:
-				if testName==exclude.lower():
-					skip = True
-					break
+			with scandir(searchDir) as entries:
+				for entry in entries:
 
-			if skip==True:
-				continue
+					#
+					# Is this file in the exclusion list?
+					#
 
-			#
-			# Is it a file? (Skip links and folders)
-			#
-			
-			fileName = os.path.join(searchDir,baseName)
-			if os.path.isfile(fileName):
+					baseName = entry.name
+					testName = baseName.lower()
+					if testName in excludes:
+						continue
+
+					#
+					# Queue up folders for scanning (Skip links to folders)
+					#
 				
-				#
-				# Check against the extension list (Skip if not on the list)
-				#
+					if solution.recursive and entry.is_dir(follow_symlinks=False):
+						folders.append((prefix + baseName,entry.path))
+						continue
+
+					#
+					# Check against the extension list (Skip if not on the list)
+					# The extension lookup also yields the file type
+					#
+				
+					filetype = codeExtensionMap.get(testName[testName.rfind('.'):])
+					if filetype is None:
+						continue
+
+					#
+					# Is it a file? (Skip links and folders)
+					# The type comes from the directory read, no stat() needed
+					#
+				
+					if not entry.is_file(follow_symlinks=False):
+						continue
 				
-				for extension in codeExtensions:
-					if testName.endswith(extension[0]):
-						#
-						# If the directory is the root, then don't prepend a directory
-						#
-						if directory=='.':
-							addedname = baseName
-						else:
-							addedname = directory + os.sep + baseName
-						
-						#
-						# Create a new entry
-						#
-						fileentry = SourceFile()
-						fileentry.filename = addedname
-						fileentry.directory = searchDir
-						fileentry.type = extension[1]
-						codefiles.append(fileentry)
-						break
-					
-	return codefiles
+					addedname = prefix + baseName
+				
+					#
+					# Create a new entry
+					#
+					fileentry = SourceFile()
+					fileentry.filename = addedname
+					fileentry.winname = converttowindowsslashes(addedname)
+					fileentry.groupname = extractgroupname(fileentry.winname)
+					fileentry.directory = searchDir
+					fileentry.type = filetype
+					codefiles.append(fileentry)
+
+			if len(codefiles)!=filecount:
+				contributed.append(directory)
+
+	#
+	# The stack order depends on the order the file system returns
+	# the folders, so keep the requested folder first and sort the
+	# subfolders under it
+	#
+	
+	contributed.sort(key=lambda folder: (folder!=rootdirectory,folder))
+	return codefiles,contributed
 
 #
 # Obtain the list of source files
@@ -319,36 +402,50 @@ def scandirectory(solution,directory,codefiles):
 def getfilelist(solution):
 
 	#
-	# Get the files in the directory list
+	# Create the exclusion lookup table once for all of the folders
+	#
+	
+	excludes = frozenset([exclude.lower() for exclude in solution.exclude])
+
+	#
+	# Scan the folders for files, the scans are waiting on
+	# the file system so each folder is read on its own thread
+	#
+	
+	def scanfolder(sourcefolder):
+		return scandirectory(solution,sourcefolder,excludes)
+	
+	sourcefolders = solution.sourcefolders
+	if len(sourcefolders)>1:
+		with ThreadPoolExecutor(max_workers=min(len(sourcefolders),maxScanThreads)) as executor:
+			results = list(executor.map(scanfolder,sourcefolders))
+	else:
+		results = [scanfolder(sourcefolder) for sourcefolder in sourcefolders]
+
+	#
+	# Merge the results in the order the folders were requested
 	#
 	
 	codefiles = []
 	includedirectories = []
-	for sourcefolder in solution.sourcefolders:
-	
-		#
-		# Scan the folder for files
-		#
-		
-		oldcount = len(codefiles)
-		codefiles = scandirectory(solution,sourcefolder,codefiles)
-		# If new files were found, add this directory to the included folders list
-		if len(codefiles)!=oldcount:
-			includedirectories.append(sourcefolder)
+	for folderfiles,contributed in results:
+		codefiles.extend(folderfiles)
+		# Every folder new files were found in is added to the included folders list
+		includedirectories.extend(contributed)
 
-	codefiles = sorted(codefiles,cmp=lambda x,y: cmp(converttowindowsslashes(x.filename),converttowindowsslashes(y.filename)))
+	codefiles.sort(key=lambda x: x.winname)
 	return codefiles,includedirectories
 
 #
-# Prune the file list for a specific type
+# Split the file list into lists keyed by file type
+# in a single pass
 #
 
-def pickfromfilelist(codefiles,type):
-	filelist = []
+def bucketfilelist(codefiles):
+	buckets = dict()
 	for codefile in codefiles:
-		if codefile.type == type:
-			filelist.append(codefile)
-	return filelist
+		buckets.setdefault(codefile.type,[]).append(codefile)
+	return buckets
 
 #
 # Given a filename with a directory, extract the filename, leaving only the directory
@@ -362,25 +459,21 @@ def extractgroupname(name):
 			return ''
 
 	#
-	# Remove the filename
+	# Skip past any ..\ at the beginning and then a single .\ prefix,
+	# only testing the directory part so the name is sliced only once
 	#
-	newname = name[0:index]
-	
-	#
-	# If there are ..\ at the beginning, remove them
-	#
-	
-	while newname.startswith('..\\') or newname.startswith('../'):
-		newname = newname[3:len(newname)]
 	
+	start = 0
+	while name.startswith(('..\\','../'),start,index):
+		start += 3
+	if name.startswith(('.\\','./'),start,index):
+		start += 2
+
 	#
-	# If there is a .\, remove the single prefix
+	# Remove the filename
 	#
 	
-	if newname.startswith('.\\') or newname.startswith('./'):
-		newname = newname[2:len(newname)]
-
-	return newname
+	return name[start:index]
 	
 	
 ###################################
@@ -389,8 +482,106 @@ def extractgroupname(name):
 #                                 #
 ###################################
 
+#
+# Templates for a configuration in a Visual Studio 2003-2008 project
+# Each configuration only has to fill in the %(...)s values
+#
+
+vcprojConfigurationTemplate = (
+	'\t\t<Configuration\n'
+	'\t\t\tName="%(token)s"\n'
+	'\t\t\tOutputDirectory="bin\\"\n'
+	'\t\t\tIntermediateDirectory="temp\\%(intermediatedirectory)s"\n'
+	'\t\t\tConfigurationType="%(configurationtype)s"\n'
+	'\t\t\tUseOfMFC="0"\n'
+	'\t\t\tATLMinimizesCRunTimeLibraryUsage="false"\n'
+	# Unicode
+	'\t\t\tCharacterSet="1"\n'
+	'\t\t\t>\n'
+	'\t\t\t<Tool\n'
+	'\t\t\t\tName="VCCLCompilerTool"\n'
+	'\t\t\t\tPreprocessorDefinitions="%(defines)s"\n'
+	'\t\t\t\tStringPooling="true"\n'
+	'\t\t\t\tExceptionHandling="0"\n'
+	'\t\t\t\tStructMemberAlignment="4"\n'
+	'\t\t\t\tEnableFunctionLevelLinking="true"\n'
+	'\t\t\t\tFloatingPointModel="2"\n'
+	'\t\t\t\tRuntimeTypeInfo="false"\n'
+	'\t\t\t\tPrecompiledHeaderFile=""\n'
+	# 8 byte alignment
+	'\t\t\t\tWarningLevel="4"\n'
+	'\t\t\t\tSuppressStartupBanner="true"\n'
+	'%(debuginformation)s'
+	'\t\t\t\tCallingConvention="1"\n'
+	'\t\t\t\tCompileAs="2"\n'
+	'\t\t\t\tFavorSizeOrSpeed="1"\n'
+	# Disable annoying nameless struct warnings since windows headers trigger this
+	'\t\t\t\tDisableSpecificWarnings="4201"\n'
+	'%(optimization)s'
+	'%(runtime)s'
+	'\t\t\t\tAdditionalIncludeDirectories="%(includes)s"\n'
+	'\t\t\t/>\n'
+	'\t\t\t<Tool\n'
+	'\t\t\t\tName="VCResourceCompilerTool"\n'
+	'\t\t\t\tCulture="1033"\n'
+	'\t\t\t/>\n')
+
+vcprojLibrarianTemplate = (
+	'\t\t\t<Tool\n'
+	'\t\t\t\tName="VCLibrarianTool"\n'
+	'\t\t\t\tOutputFile="&quot;$(OutDir)%(intdirectory)s.lib&quot;"\n'
+	'\t\t\t\tSuppressStartupBanner="true"\n'
+	'\t\t\t/>\n'
+	'%(postbuild)s')
+
+vcprojLinkerTemplate = (
+	'\t\t\t<Tool\n'
+	'\t\t\t\tName="VCLinkerTool"\n'
+	'\t\t\t\tOutputFile="&quot;$(OutDir)%(intdirectory)s.exe&quot;"\n'
+	'\t\t\t\tAdditionalLibraryDirectories="%(libraries)s"\n'
+	'\t\t\t\tSubSystem="%(subsystem)s"\n'
+	'\t\t\t/>\n')
+
+vcprojConfigurationEnd = '\t\t</Configuration>\n'
+
+# Copies a library to the final folder with perforce
+vcprojPostBuildTemplate = (
+	'\t\t\t<Tool\n'
+	'\t\t\t\tName="VCPostBuildEventTool"\n'
+	'\t\t\t\tDescription="Copying $(TargetName)$(TargetExt) to %(final)s"\n'
+	'\t\t\t\tCommandLine="&quot;$(perforce)\\p4&quot; edit &quot;%(final)s$(TargetName)$(TargetExt)&quot;&#x0D;&#x0A;'
+	'&quot;$(perforce)\\p4&quot; edit &quot;%(final)s$(TargetName).pdb&quot;&#x0D;&#x0A;'
+	'copy /Y &quot;$(OutDir)$(TargetName)$(TargetExt)&quot; &quot;%(final)s$(TargetName)$(TargetExt)&quot;&#x0D;&#x0A;'
+	'copy /Y &quot;$(OutDir)$(TargetName).pdb&quot; &quot;%(final)s$(TargetName).pdb&quot;&#x0D;&#x0A;'
+	'&quot;$(perforce)\\p4&quot; revert -a &quot;%(final)s$(TargetName)$(TargetExt)&quot;&#x0D;&#x0A;'
+	'&quot;$(perforce)\\p4&quot; revert -a &quot;%(final)s$(TargetName).pdb&quot;&#x0D;&#x0A;"\n'
+	'\t\t\t/>\n')
+
+vcprojDebugInformation = (
+	'\t\t\t\tDebugInformationFormat="3"\n'
+	'\t\t\t\tProgramDataBaseFileName="$(OutDir)\\$(TargetName).pdb"\n')
+vcprojNoDebugInformation = '\t\t\t\tDebugInformationFormat="0"\n'
+
+vcprojOptimizationOff = '\t\t\t\tOptimization="0"\n'
+# Necessary to quiet Visual Studio 2008 warnings
+vcprojOptimizationOff2008 = vcprojOptimizationOff + '\t\t\t\tEnableIntrinsicFunctions="true"\n'
+vcprojOptimizationOn = (
+	'\t\t\t\tOptimization="2"\n'
+	'\t\t\t\tInlineFunctionExpansion="2"\n'
+	'\t\t\t\tEnableIntrinsicFunctions="true"\n'
+	'\t\t\t\tOmitFramePointers="true"\n')
+
+vcprojReleaseRuntime = (
+	'\t\t\t\tBufferSecurityCheck="false"\n'
+	'\t\t\t\tRuntimeLibrary="0"\n')
+vcprojDebugRuntime = (
+	'\t\t\t\tBufferSecurityCheck="true"\n'
+	'\t\t\t\tRuntimeLibrary="1"\n')
+
 #
 # Create Visual Studio .sln file for Visual Studio 2003-2013
+# Returns the error code, the project filename (Sans extension)
+# and the project's uuid so the project file can reuse them
 #
 
 def createslnfile(solution):
@@ -425,7 +616,7 @@ def createslnfile(solution):
 		projectsuffix = '.vcxproj'
 	else:
 		# Not supported yet
-		return 10,None
+		return 10,None,None
 	
 	#
 	# Determine the filename (Sans extension)
@@ -443,611 +634,359 @@ def createslnfile(solution):
 	solutionpathname = os.path.join(solution.workingDir,projectfilename + '.sln')
 	
 	#
-	# Start writing the project file
-	#
-	fp = open(solutionpathname,'w')
-	
-	#
-	# Save off the UTF-8 header marker
+	# Build the solution file in memory
 	#
-	fp.write('\xef\xbb\xbf\n')
+	output = []
 	
 	#
 	# Save off the format header
 	#
-	fp.write('Microsoft Visual Studio Solution File, Format Version ' + formatversion + '\n')
-	fp.write('# Visual Studio ' + yearversion + '\n')
+	output.append(f'Microsoft Visual Studio Solution File, Format Version {formatversion}\n')
+	output.append(f'# Visual Studio {yearversion}\n')
 
-	fp.write('Project("{8BC9CEB8-8B4A-11D0-8D11-00A0C91BC942}") = "' + solution.projectname + '", "' + projectfilename + projectsuffix + '", "{' + solutionuuid + '}"\n')
-	fp.write('EndProject\n')
+	output.append(f'Project("{{8BC9CEB8-8B4A-11D0-8D11-00A0C91BC942}}") = "{solution.projectname}", "{projectfilename}{projectsuffix}", "{{{solutionuuid}}}"\n')
+	output.append('EndProject\n')
 	
-	fp.write('Global\n')
+	output.append('Global\n')
 
 	#
 	# Write out the SolutionConfigurationPlatforms
 	#
 	
 	vsplatforms = getvsplatform(solution.platform)
-	fp.write('\tGlobalSection(SolutionConfigurationPlatforms) = preSolution\n')
+	output.append('\tGlobalSection(SolutionConfigurationPlatforms) = preSolution\n')
 	for target in solution.configurations:
 		for vsplatform in vsplatforms:
-			token = target + '|' + vsplatform
-			fp.write('\t\t' + token + ' = ' + token + '\n')
-	fp.write('\tEndGlobalSection\n')
+			token = f'{target}|{vsplatform}'
+			output.append(f'\t\t{token} = {token}\n')
+	output.append('\tEndGlobalSection\n')
 
 	#
 	# Write out the ProjectConfigurationPlatforms
 	#
 	
-	fp.write('\tGlobalSection(ProjectConfigurationPlatforms) = postSolution\n')
+	output.append('\tGlobalSection(ProjectConfigurationPlatforms) = postSolution\n')
 	for target in solution.configurations:
 		for vsplatform in vsplatforms:
-			token = target + '|' + vsplatform
-			fp.write('\t\t{' + solutionuuid + '}.' + token + '.ActiveCfg = ' + token + '\n')
-			fp.write('\t\t{' + solutionuuid + '}.' + token + '.Build.0 = ' + token + '\n')
-	fp.write('\tEndGlobalSection\n')
+			token = f'{target}|{vsplatform}'
+			output.append(f'\t\t{{{solutionuuid}}}.{token}.ActiveCfg = {token}\n')
+			output.append(f'\t\t{{{solutionuuid}}}.{token}.Build.0 = {token}\n')
+	output.append('\tEndGlobalSection\n')
 
 	
 	#
 	# Hide nodes section
 	#
 	
-	fp.write('\tGlobalSection(SolutionProperties) = preSolution\n')
-	fp.write('\t\tHideSolutionNode = FALSE\n')
-	fp.write('\tEndGlobalSection\n')
+	output.append('\tGlobalSection(SolutionProperties) = preSolution\n')
+	output.append('\t\tHideSolutionNode = FALSE\n')
+	output.append('\tEndGlobalSection\n')
 	
 	#
 	# Close it up!
 	#
 	
-	fp.write('EndGlobal\n')	
-	fp.close()
-	return 0,projectfilename
+	output.append('EndGlobal\n')
+	
+	#
+	# Write it out in one pass, Visual Studio
+	# wants the UTF-8 header marker first
+	#
+	
+	savefile(solutionpathname,output,b'\xef\xbb\xbf\n')
+	return 0,projectfilename,solutionuuid
 	
 #
 # Dump out a recursive tree of files to reconstruct a
 # directory hiearchy for a file list
 #
+# The tree is walked with a stack instead of recursion,
+# an entry with no subtree closes the filter it belongs to
+#
 # Used by Visual Studio 2003, 2005 and 2008
 #
 
-def dumptreevs2005(indent,string,entry,fp,groups):
-	for item in entry:
+def dumptreevs2005(indent,string,entry,output,groups):
+	# The tab prefix of each level is built once and carried on the stack
+	grouptabs = '\t'*indent
+	innertabs = grouptabs + '\t'
+	stack = [(grouptabs,innertabs,string,item,entry[item]) for item in reversed(list(entry))]
+	while stack:
+		grouptabs,innertabs,string,item,key = stack.pop()
+		if key is None:
+			output.append(f'{grouptabs}</Filter>\n')
+			continue
 		if item!='':
-			fp.write('\t'*indent + '<Filter Name="' + item + '">\n')
+			output.append(f'{grouptabs}<Filter Name="{item}">\n')
 		if string=='':
 			merged = item
 		else:
-			merged = string + '\\' + item
+			merged = f'{string}\\{item}'
 		if merged in groups:
 			if item!='':
-				tabs = '\t'*(indent+1)
+				tabs = innertabs
 			else:
-				tabs = '\t'*indent
-			sortlist = sorted(groups[merged],cmp=lambda x,y: cmp(x,y))
-			for file in sortlist:
-				fp.write(tabs + '<File RelativePath="' + file + '" />\n')					
-		key = entry[item]
-		# Recurse down the tree
-		if type(key) is dict:
-			dumptreevs2005(indent+1,merged,key,fp,groups)
+				tabs = grouptabs
+			for file in sorted(groups[merged]):
+				output.append(f'{tabs}<File RelativePath="{file}" />\n')
 		if item!='':
-			fp.write('\t'*indent + '</Filter>\n')
+			stack.append((grouptabs,innertabs,string,item,None))
+		# Push the children so they come off the stack in order
+		if type(key) is dict:
+			childtabs = innertabs + '\t'
+			stack.extend([(innertabs,childtabs,merged,child,key[child]) for child in reversed(list(key))])
 	
 #
-# Create the solution and project file for visual studio 2005
+# Create the solution and project file for visual studio 2005 or 2008
+#
+# version is the .vcproj format version, optimizationoff is the
+# compiler block for unoptimized builds and intermediatesuffix is
+# appended to the intermediate directory
 #
 
-def createvs2005solution(solution):
-	error,projectfilename = createslnfile(solution)
+def createvcprojsolution(solution,version,optimizationoff,intermediatesuffix):
+	error,projectfilename,solutionuuid = createslnfile(solution)
 	if error!=0:
 		return error
-		
+
 	#
 	# Now, let's create the project file
 	#
 	
 	codefiles,includedirectories = getfilelist(solution)
 	platformcode = getplatformcode(solution.platform)
-	solutionuuid = str(uuid.uuid3(uuid.NAMESPACE_DNS,str(projectfilename))).upper()
+	vsplatforms = getvsplatform(solution.platform)
 	projectpathname = os.path.join(solution.workingDir,projectfilename + '.vcproj')
-	fp = open(projectpathname,'w')
+	output = []
 	
 	#
 	# Save off the xml header
 	#
 	
-	fp.write('<?xml version="1.0" encoding="utf-8"?>\n')
-	fp.write('<VisualStudioProject\n')
-	fp.write('\tProjectType="Visual C++"\n')
-	fp.write('\tVersion="8.00"\n')
-	fp.write('\tName="' + solution.projectname + '"\n')
-	fp.write('\tProjectGUID="{' + solutionuuid + '}"\n')
-	fp.write('\t>\n')
+	output.append('<?xml version="1.0" encoding="utf-8"?>\n')
+	output.append('<VisualStudioProject\n')
+	output.append('\tProjectType="Visual C++"\n')
+	output.append(f'\tVersion="{version}"\n')
+	output.append(f'\tName="{solution.projectname}"\n')
+	output.append(f'\tProjectGUID="{{{solutionuuid}}}"\n')
+	output.append('\t>\n')
 
 	#
 	# Write the project platforms
 	#
 
-	fp.write('\t<Platforms>\n')
-	for vsplatform in getvsplatform(solution.platform):
-		fp.write('\t\t<Platform Name="' + vsplatform + '" />\n')
-	fp.write('\t</Platforms>\n')
+	output.append('\t<Platforms>\n')
+	for vsplatform in vsplatforms:
+		output.append(f'\t\t<Platform Name="{vsplatform}" />\n')
+	output.append('\t</Platforms>\n')
 
 	#
 	# Write the project configurations
 	#
 	
-	fp.write('\t<Configurations>\n')
+	#
+	# Values that are the same for every configuration
+	#
+	
+	idecode = getidecode(solution)
+	definestring = ''.join([';' + item for item in solution.defines])
+	included = [converttowindowsslashes(dir) for dir in includedirectories + solution.includefolders]
+	if platformcode=='win':
+		included.append('$(SDKS)\\windows\\directx9;$(SDKS)\\windows\\opengl')
+	includestring = ';'.join(included)
+	librarystring = ';'.join([converttowindowsslashes(item) for item in solution.includefolders] + ['$(SDKS)\\windows\\opengl'])
+	
+	#
+	# Build the configuration template once for this kind of project
+	#
+	
+	values = {
+		'includes':includestring,
+		'libraries':librarystring,
+		'postbuild':''
+		}
+	if solution.kind=='library':
+		# Library
+		values['configurationtype'] = '4'
+		template = vcprojConfigurationTemplate + vcprojLibrarianTemplate + vcprojConfigurationEnd
+		if solution.finalfolder!=None:
+			finalfolder = converttowindowsslasheswithendslash(solution.finalfolder)
+			values['postbuild'] = vcprojPostBuildTemplate % {'final':finalfolder}
+	else:
+		# Application
+		values['configurationtype'] = '1'
+		template = vcprojConfigurationTemplate + vcprojLinkerTemplate + vcprojConfigurationEnd
+		if solution.kind=='tool':
+			# main()
+			values['subsystem'] = '1'
+		else:
+			# WinMain()
+			values['subsystem'] = '2'
+	
+	output.append('\t<Configurations>\n')
 	for target in solution.configurations:
-		for vsplatform in getvsplatform(solution.platform):
-			token = target + '|' + vsplatform
-			fp.write('\t\t<Configuration\n')
-			fp.write('\t\t\tName="' + token + '"\n')
-			fp.write('\t\t\tOutputDirectory="bin\\"\n')
+		configurationcode = getconfigurationcode(target)
+		if target=='Release':
+			debugdefine = 'NDEBUG'
+			values['runtime'] = vcprojReleaseRuntime
+		else:
+			debugdefine = '_DEBUG'
+			values['runtime'] = vcprojDebugRuntime
+		if solution.kind=='library' or target!='Release':
+			values['debuginformation'] = vcprojDebugInformation
+		else:
+			values['debuginformation'] = vcprojNoDebugInformation
+		if target=='Debug':
+			values['optimization'] = optimizationoff
+		else:
+			values['optimization'] = vcprojOptimizationOn
+			
+		for vsplatform in vsplatforms:
 			if vsplatform=='x64':
 				platformcode2 = 'w64'
+				platformdefines = ';WIN64;_WINDOWS'
 			elif vsplatform=='Win32':
 				platformcode2 = 'w32'
+				platformdefines = ';WIN32;_WINDOWS'
 			else:
 				platformcode2 = platformcode
-			intdirectory = solution.projectname + getidecode(solution) + platformcode2 + getconfigurationcode(target)
-			fp.write('\t\t\tIntermediateDirectory="temp\\' + intdirectory + '"\n')
-			if solution.kind=='library':
-				# Library
-				fp.write('\t\t\tConfigurationType="4"\n')
-			else:
-				# Application
-				fp.write('\t\t\tConfigurationType="1"\n')
-			fp.write('\t\t\tUseOfMFC="0"\n')
-			fp.write('\t\t\tATLMinimizesCRunTimeLibraryUsage="false"\n')
-			# Unicode
-			fp.write('\t\t\tCharacterSet="1"\n')
-			fp.write('\t\t\t>\n')
-
-			fp.write('\t\t\t<Tool\n')
-			fp.write('\t\t\t\tName="VCCLCompilerTool"\n')
-			fp.write('\t\t\t\tPreprocessorDefinitions="')
-			if target=='Release':
-				fp.write('NDEBUG')
-			else:
-				fp.write('_DEBUG')
-			if vsplatform=='x64':
-				fp.write(';WIN64;_WINDOWS')
-			elif vsplatform=='Win32':
-				fp.write(';WIN32;_WINDOWS')
-			for item in solution.defines:
-				fp.write(';' + item)
-			fp.write('"\n')
-
-			fp.write('\t\t\t\tStringPooling="true"\n')
-			fp.write('\t\t\t\tExceptionHandling="0"\n')
-			fp.write('\t\t\t\tStructMemberAlignment="4"\n')
-			fp.write('\t\t\t\tEnableFunctionLevelLinking="true"\n')
-			fp.write('\t\t\t\tFloatingPointModel="2"\n')
-			fp.write('\t\t\t\tRuntimeTypeInfo="false"\n')
-			fp.write('\t\t\t\tPrecompiledHeaderFile=""\n')
-			# 8 byte alignment
-			fp.write('\t\t\t\tWarningLevel="4"\n')
-			fp.write('\t\t\t\tSuppressStartupBanner="true"\n')
-			if solution.kind=='library' or target!='Release':
-				fp.write('\t\t\t\tDebugInformationFormat="3"\n')
-				fp.write('\t\t\t\tProgramDataBaseFileName="$(OutDir)\$(TargetName).pdb"\n')
-			else:
-				fp.write('\t\t\t\tDebugInformationFormat="0"\n')
-			
-			fp.write('\t\t\t\tCallingConvention="1"\n')
-			fp.write('\t\t\t\tCompileAs="2"\n')
-			fp.write('\t\t\t\tFavorSizeOrSpeed="1"\n')
-			# Disable annoying nameless struct warnings since windows headers trigger this
-			fp.write('\t\t\t\tDisableSpecificWarnings="4201"\n')
-
-			if target=='Debug':
-				fp.write('\t\t\t\tOptimization="0"\n')
-			else:
-				fp.write('\t\t\t\tOptimization="2"\n')
-				fp.write('\t\t\t\tInlineFunctionExpansion="2"\n')
-				fp.write('\t\t\t\tEnableIntrinsicFunctions="true"\n')
-				fp.write('\t\t\t\tOmitFramePointers="true"\n')
-			if target=='Release':
-				fp.write('\t\t\t\tBufferSecurityCheck="false"\n')
-				fp.write('\t\t\t\tRuntimeLibrary="0"\n')
-			else:
-				fp.write('\t\t\t\tBufferSecurityCheck="true"\n')
-				fp.write('\t\t\t\tRuntimeLibrary="1"\n')
-				
-			#
-			# Include directories
-			#
-			fp.write('\t\t\t\tAdditionalIncludeDirectories="')
-			addcolon = False
-			included = includedirectories + solution.includefolders
-			if len(included):
-				for dir in included:
-					if addcolon==True:
-						fp.write(';')
-					fp.write(converttowindowsslashes(dir))
-					addcolon = True
-			if platformcode=='win':
-				if addcolon==True:
-					fp.write(';')
-				fp.write('$(SDKS)\windows\directx9;$(SDKS)\windows\opengl')
-				addcolon = True
-			fp.write('"\n')
-			fp.write('\t\t\t/>\n')
-			
-			fp.write('\t\t\t<Tool\n')
-			fp.write('\t\t\t\tName="VCResourceCompilerTool"\n')
-			fp.write('\t\t\t\tCulture="1033"\n')
-			fp.write('\t\t\t/>\n')
-			
-			if solution.kind=='library':
-				fp.write('\t\t\t<Tool\n')
-				fp.write('\t\t\t\tName="VCLibrarianTool"\n')
-				fp.write('\t\t\t\tOutputFile="&quot;$(OutDir)' + intdirectory + '.lib&quot;"\n')
-				fp.write('\t\t\t\tSuppressStartupBanner="true"\n')
-				fp.write('\t\t\t/>\n')
-				if solution.finalfolder!=None:
-					finalfolder = converttowindowsslasheswithendslash(solution.finalfolder)
-					fp.write('\t\t\t<Tool\n')
-					fp.write('\t\t\t\tName="VCPostBuildEventTool"\n')
-					fp.write('\t\t\t\tDescription="Copying $(TargetName)$(TargetExt) to ' + finalfolder + '"\n')
-					fp.write('\t\t\t\tCommandLine="&quot;$(perforce)\p4&quot; edit &quot;' + finalfolder + '$(TargetName)$(TargetExt)&quot;&#x0D;&#x0A;')
-					fp.write('&quot;$(perforce)\p4&quot; edit &quot;' + finalfolder + '$(TargetName).pdb&quot;&#x0D;&#x0A;')
-					fp.write('copy /Y &quot;$(OutDir)$(TargetName)$(TargetExt)&quot; &quot;' + finalfolder + '$(TargetName)$(TargetExt)&quot;&#x0D;&#x0A;')
-					fp.write('copy /Y &quot;$(OutDir)$(TargetName).pdb&quot; &quot;' + finalfolder + '$(TargetName).pdb&quot;&#x0D;&#x0A;')
-					fp.write('&quot;$(perforce)\p4&quot; revert -a &quot;' + finalfolder + '$(TargetName)$(TargetExt)&quot;&#x0D;&#x0A;')
-					fp.write('&quot;$(perforce)\p4&quot; revert -a &quot;' + finalfolder + '$(TargetName).pdb&quot;&#x0D;&#x0A;"\n')
-					fp.write('\t\t\t/>\n')
-			else:
-				fp.write('\t\t\t<Tool\n')
-				fp.write('\t\t\t\tName="VCLinkerTool"\n')
-				fp.write('\t\t\t\tOutputFile="&quot;$(OutDir)' + intdirectory + '.exe&quot;"\n')
-				fp.write('\t\t\t\tAdditionalLibraryDirectories="')
-				addcolon = False
-				for item in solution.includefolders:
-					if addcolon==True:
-						fp.write(';')
-					fp.write(converttowindowsslashes(item))
-					addcolon = True
-					
-				if addcolon==True:
-					fp.write(';')
-				fp.write('$(SDKS)\windows\opengl"\n')
-				if solution.kind=='tool':
-					# main()
-					fp.write('\t\t\t\tSubSystem="1"\n')
-				else:
-					# WinMain()
-					fp.write('\t\t\t\tSubSystem="2"\n')
-				fp.write('\t\t\t/>\n')
-			fp.write('\t\t</Configuration>\n')
-
-	fp.write('\t</Configurations>\n')	
+				platformdefines = ''
+			intdirectory = f'{solution.projectname}{idecode}{platformcode2}{configurationcode}'
+			values['token'] = f'{target}|{vsplatform}'
+			values['intdirectory'] = intdirectory
+			values['intermediatedirectory'] = intdirectory + intermediatesuffix
+			values['defines'] = debugdefine + platformdefines + definestring
+			output.append(template % values)
+
+	output.append('\t</Configurations>\n')
 		
 	#
 	# Save out the filenames
 	#
 	
-	listh = pickfromfilelist(codefiles,'h')
-	listcpp = pickfromfilelist(codefiles,'cpp')
+	buckets = bucketfilelist(codefiles)
+	listh = buckets.get('h',[])
+	listcpp = buckets.get('cpp',[])
 	listwindowsresource = []
 	listhlsl = []
 	if platformcode=='win':
-		listwindowsresource = pickfromfilelist(codefiles,'windowsresource')
-		listhlsl = pickfromfilelist(codefiles,'hlsl')
+		listwindowsresource = buckets.get('windowsresource',[])
+		listhlsl = buckets.get('hlsl',[])
 	
 	alllists = listh + listcpp + listwindowsresource
 	if len(alllists):
 
 		#	
 		# Create groups first since Visual Studio uses a nested tree structure
-		# for file groupings
+		# for file groupings, so build the groups and the recursive
+		# tree used to store out the file list in one pass
 		#
 		
 		groups = dict()
+		tree = dict()
 		for item in alllists:
-			groupname = converttowindowsslashes(extractgroupname(item.filename))
+			groupname = item.groupname
 			# Put each filename in its proper group
-			if groupname in groups:
-				groups[groupname].append(converttowindowsslashes(item.filename))
+			group = groups.get(groupname)
+			if group is not None:
+				group.append(item.winname)
 			else:
-				# New group!
-				groups[groupname] = [converttowindowsslashes(item.filename)]
-		
-		#
-		# Create a recursive tree in order to store out the file list
-		#
-
-		fp.write('\t<Files>\n')
-		tree = dict()
-		for group in groups:
-			#
-			# Get the depth of the tree needed
-			#
-			
-			parts = group.split('\\')
-			next = tree
-			#
-			# Iterate over every part
-			#
-			for x in xrange(len(parts)):
-				# Already declared?
-				if not parts[x] in next:
-					next[parts[x]] = dict()
-				# Step into the tree
-				next = next[parts[x]]
+				# New group! Add its folders to the tree
+				groups[groupname] = [item.winname]
+				branch = tree
+				for part in groupname.split('\\'):
+					branch = branch.setdefault(part,dict())
 
 		# Use this tree to play back all the data
-		dumptreevs2005(2,'',tree,fp,groups)
-		fp.write('\t</Files>\n')
+		output.append('\t<Files>\n')
+		dumptreevs2005(2,'',tree,output,groups)
+		output.append('\t</Files>\n')
 		
-	fp.write('</VisualStudioProject>\n')
-	fp.close()
-
-	return 0
-
-			
-#
-# Create the solution and project file for visual studio 2008
-#
-
-def createvs2008solution(solution):
-	error,projectfilename = createslnfile(solution)
-	if error!=0:
-		return error
-	#
-	# Now, let's create the project file
-	#
-	
-	codefiles,includedirectories = getfilelist(solution)
-	platformcode = getplatformcode(solution.platform)
-	solutionuuid = str(uuid.uuid3(uuid.NAMESPACE_DNS,str(projectfilename))).upper()
-	projectpathname = os.path.join(solution.workingDir,projectfilename + '.vcproj')
-	fp = open(projectpathname,'w')
+	output.append('</VisualStudioProject>\n')
 	
 	#
-	# Save off the xml header
+	# Write it out in one pass as UTF-8
 	#
 	
-	fp.write('<?xml version="1.0" encoding="utf-8"?>\n')
-	fp.write('<VisualStudioProject\n')
-	fp.write('\tProjectType="Visual C++"\n')
-	fp.write('\tVersion="9.00"\n')
-	fp.write('\tName="' + solution.projectname + '"\n')
-	fp.write('\tProjectGUID="{' + solutionuuid + '}"\n')
-	fp.write('\t>\n')
+	savefile(projectpathname,output)
 
-	#
-	# Write the project platforms
-	#
+	return 0
 
-	fp.write('\t<Platforms>\n')
-	for vsplatform in getvsplatform(solution.platform):
-		fp.write('\t\t<Platform Name="' + vsplatform + '" />\n')
-	fp.write('\t</Platforms>\n')
+#
+# Create the solution and project file for visual studio 2005
+#
 
-	#
-	# Write the project configurations
-	#
-	
-	fp.write('\t<Configurations>\n')
-	for target in solution.configurations:
-		for vsplatform in getvsplatform(solution.platform):
-			token = target + '|' + vsplatform
-			fp.write('\t\t<Configuration\n')
-			fp.write('\t\t\tName="' + token + '"\n')
-			fp.write('\t\t\tOutputDirectory="bin\\"\n')
-			if vsplatform=='x64':
-				platformcode2 = 'w64'
-			elif vsplatform=='Win32':
-				platformcode2 = 'w32'
-			else:
-				platformcode2 = platformcode
-			intdirectory = solution.projectname + getidecode(solution) + platformcode2 + getconfigurationcode(target)
-			fp.write('\t\t\tIntermediateDirectory="temp\\' + intdirectory + '\\"\n')
-			if solution.kind=='library':
-				# Library
-				fp.write('\t\t\tConfigurationType="4"\n')
-			else:
-				# Application
-				fp.write('\t\t\tConfigurationType="1"\n')
-			fp.write('\t\t\tUseOfMFC="0"\n')
-			fp.write('\t\t\tATLMinimizesCRunTimeLibraryUsage="false"\n')
-			# Unicode
-			fp.write('\t\t\tCharacterSet="1"\n')
-			fp.write('\t\t\t>\n')
-
-			fp.write('\t\t\t<Tool\n')
-			fp.write('\t\t\t\tName="VCCLCompilerTool"\n')
-			fp.write('\t\t\t\tPreprocessorDefinitions="')
-			if target=='Release':
-				fp.write('NDEBUG')
-			else:
-				fp.write('_DEBUG')
-			if vsplatform=='x64':
-				fp.write(';WIN64;_WINDOWS')
-			elif vsplatform=='Win32':
-				fp.write(';WIN32;_WINDOWS')
-			for item in solution.defines:
-				fp.write(';' + item)
-			fp.write('"\n')
-
-			fp.write('\t\t\t\tStringPooling="true"\n')
-			fp.write('\t\t\t\tExceptionHandling="0"\n')
-			fp.write('\t\t\t\tStructMemberAlignment="4"\n')
-			fp.write('\t\t\t\tEnableFunctionLevelLinking="true"\n')
-			fp.write('\t\t\t\tFloatingPointModel="2"\n')
-			fp.write('\t\t\t\tRuntimeTypeInfo="false"\n')
-			fp.write('\t\t\t\tPrecompiledHeaderFile=""\n')
-			# 8 byte alignment
-			fp.write('\t\t\t\tWarningLevel="4"\n')
-			fp.write('\t\t\t\tSuppressStartupBanner="true"\n')
-			if solution.kind=='library' or target!='Release':
-				fp.write('\t\t\t\tDebugInformationFormat="3"\n')
-				fp.write('\t\t\t\tProgramDataBaseFileName="$(OutDir)\$(TargetName).pdb"\n')
-			else:
-				fp.write('\t\t\t\tDebugInformationFormat="0"\n')
-			
-			fp.write('\t\t\t\tCallingConvention="1"\n')
-			fp.write('\t\t\t\tCompileAs="2"\n')
-			fp.write('\t\t\t\tFavorSizeOrSpeed="1"\n')
-			# Disable annoying nameless struct warnings since windows headers trigger this
-			fp.write('\t\t\t\tDisableSpecificWarnings="4201"\n')
-
-			if target=='Debug':
-				fp.write('\t\t\t\tOptimization="0"\n')
-				# Necessary to quiet Visual Studio 2008 warnings
-				fp.write('\t\t\t\tEnableIntrinsicFunctions="true"\n')
-			else:
-				fp.write('\t\t\t\tOptimization="2"\n')
-				fp.write('\t\t\t\tInlineFunctionExpansion="2"\n')
-				fp.write('\t\t\t\tEnableIntrinsicFunctions="true"\n')
-				fp.write('\t\t\t\tOmitFramePointers="true"\n')
-			if target=='Release':
-				fp.write('\t\t\t\tBufferSecurityCheck="false"\n')
-				fp.write('\t\t\t\tRuntimeLibrary="0"\n')
-			else:
-				fp.write('\t\t\t\tBufferSecurityCheck="true"\n')
-				fp.write('\t\t\t\tRuntimeLibrary="1"\n')
-				
-			#
-			# Include directories
-			#
-			fp.write('\t\t\t\tAdditionalIncludeDirectories="')
-			addcolon = False
-			included = includedirectories + solution.includefolders
-			if len(included):
-				for dir in included:
-					if addcolon==True:
-						fp.write(';')
-					fp.write(converttowindowsslashes(dir))
-					addcolon = True
-			if platformcode=='win':
-				if addcolon==True:
-					fp.write(';')
-				fp.write('$(SDKS)\windows\directx9;$(SDKS)\windows\opengl')
-				addcolon = True
-			fp.write('"\n')
-			fp.write('\t\t\t/>\n')
-			
-			fp.write('\t\t\t<Tool\n')
-			fp.write('\t\t\t\tName="VCResourceCompilerTool"\n')
-			fp.write('\t\t\t\tCulture="1033"\n')
-			fp.write('\t\t\t/>\n')
-			
-			if solution.kind=='library':
-				fp.write('\t\t\t<Tool\n')
-				fp.write('\t\t\t\tName="VCLibrarianTool"\n')
-				fp.write('\t\t\t\tOutputFile="&quot;$(OutDir)' + intdirectory + '.lib&quot;"\n')
-				fp.write('\t\t\t\tSuppressStartupBanner="true"\n')
-				fp.write('\t\t\t/>\n')
-				if solution.finalfolder!=None:
-					finalfolder = converttowindowsslasheswithendslash(solution.finalfolder)
-					fp.write('\t\t\t<Tool\n')
-					fp.write('\t\t\t\tName="VCPostBuildEventTool"\n')
-					fp.write('\t\t\t\tDescription="Copying $(TargetName)$(TargetExt) to ' + finalfolder + '"\n')
-					fp.write('\t\t\t\tCommandLine="&quot;$(perforce)\p4&quot; edit &quot;' + finalfolder + '$(TargetName)$(TargetExt)&quot;&#x0D;&#x0A;')
-					fp.write('&quot;$(perforce)\p4&quot; edit &quot;' + finalfolder + '$(TargetName).pdb&quot;&#x0D;&#x0A;')
-					fp.write('copy /Y &quot;$(OutDir)$(TargetName)$(TargetExt)&quot; &quot;' + finalfolder + '$(TargetName)$(TargetExt)&quot;&#x0D;&#x0A;')
-					fp.write('copy /Y &quot;$(OutDir)$(TargetName).pdb&quot; &quot;' + finalfolder + '$(TargetName).pdb&quot;&#x0D;&#x0A;')
-					fp.write('&quot;$(perforce)\p4&quot; revert -a &quot;' + finalfolder + '$(TargetName)$(TargetExt)&quot;&#x0D;&#x0A;')
-					fp.write('&quot;$(perforce)\p4&quot; revert -a &quot;' + finalfolder + '$(TargetName).pdb&quot;&#x0D;&#x0A;"\n')
-					fp.write('\t\t\t/>\n')
-			else:
-				fp.write('\t\t\t<Tool\n')
-				fp.write('\t\t\t\tName="VCLinkerTool"\n')
-				fp.write('\t\t\t\tOutputFile="&quot;$(OutDir)' + intdirectory + '.exe&quot;"\n')
-				fp.write('\t\t\t\tAdditionalLibraryDirectories="')
-				addcolon = False
-				for item in solution.includefolders:
-					if addcolon==True:
-						fp.write(';')
-					fp.write(converttowindowsslashes(item))
-					addcolon = True
-					
-				if addcolon==True:
-					fp.write(';')
-				fp.write('$(SDKS)\windows\opengl"\n')
-				if solution.kind=='tool':
-					# main()
-					fp.write('\t\t\t\tSubSystem="1"\n')
-				else:
-					# WinMain()
-					fp.write('\t\t\t\tSubSystem="2"\n')
-				fp.write('\t\t\t/>\n')
-			fp.write('\t\t</Configuration>\n')
-
-	fp.write('\t</Configurations>\n')	
-		
-	#
-	# Save out the filenames
-	#
-	
-	listh = pickfromfilelist(codefiles,'h')
-	listcpp = pickfromfilelist(codefiles,'cpp')
-	listwindowsresource = []
-	listhlsl = []
-	if platformcode=='win':
-		listwindowsresource = pickfromfilelist(codefiles,'windowsresource')
-		listhlsl = pickfromfilelist(codefiles,'hlsl')
-	
-	alllists = listh + listcpp + listwindowsresource
-	if len(alllists):
+def createvs2005solution(solution):
+	return createvcprojsolution(solution,'8.00',vcprojOptimizationOff,'')
 
-		#	
-		# Create groups first
-		#
-		
-		groups = dict()
-		for item in alllists:
-			groupname = converttowindowsslashes(extractgroupname(item.filename))
-			# Put each filename in its proper group
-			if groupname in groups:
-				groups[groupname].append(converttowindowsslashes(item.filename))
-			else:
-				# New group!
-				groups[groupname] = [converttowindowsslashes(item.filename)]
-		
-		#
-		# Create a recursive tree in order to store out the file list
-		#
+#
+# Create the solution and project file for visual studio 2008
+#
 
-		fp.write('\t<Files>\n')
-		tree = dict()
-		for group in groups:
-			#
-			# Get the depth of the tree needed
-			#
-			
-			parts = group.split('\\')
-			next = tree
-			#
-			# Iterate over every part
-			#
-			for x in xrange(len(parts)):
-				# Already declared?
-				if not parts[x] in next:
-					next[parts[x]] = dict()
-				# Step into the tree
-				next = next[parts[x]]
+def createvs2008solution(solution):
+	return createvcprojsolution(solution,'9.00',vcprojOptimizationOff2008,'\\')
+
+#
+# Fixed sections of a Visual Studio 2010 project
+#
+
+vcxprojHeader = (
+	'<?xml version="1.0" encoding="utf-8"?>\n'
+	'<Project DefaultTargets="Build" ToolsVersion="4.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">\n')
+
+vcxprojShieldHeader = (
+	'\t<PropertyGroup Label="NsightTegraProject">\n'
+	'\t\t<NsightTegraProjectRevisionNumber>4</NsightTegraProjectRevisionNumber>\n'
+	'\t</PropertyGroup>\n')
+
+# The property sheets, %(kind)s selects the burger props file
+vcxprojImportsTemplate = (
+	'\t<Import Project="$(VCTargetsPath)\\Microsoft.Cpp.Default.props" />\n'
+	'\t<Import Project="$(SDKS)\\visualstudio\\burger.%(kind)sv10.props" />\n'
+	'\t<Import Project="$(VCTargetsPath)\\Microsoft.Cpp.props" />\n'
+	'\t<ImportGroup Label="ExtensionSettings" />\n'
+	'\t<ImportGroup Label="PropertySheets" />\n'
+	'\t<PropertyGroup Label="UserMacros" />\n')
+vcxprojImportsLibrary = vcxprojImportsTemplate % {'kind':'lib'}
+vcxprojImportsTool = vcxprojImportsTemplate % {'kind':'tool'}
+vcxprojImportsGame = vcxprojImportsTemplate % {'kind':'game'}
+
+# Needed for the PS3 and PS4 targets
+vcxprojSonyDefines = (
+	'\t<ItemDefinitionGroup Condition="\'$(BurgerConfiguration)\'!=\'Release\'">\n'
+	'\t\t<ClCompile>\n'
+	'\t\t\t<PreprocessorDefinitions>_DEBUG;%(PreprocessorDefinitions)</PreprocessorDefinitions>\n'
+	'\t\t</ClCompile>\n'
+	'\t</ItemDefinitionGroup>\n'
+	'\t<ItemDefinitionGroup Condition="\'$(BurgerConfiguration)\'==\'Release\'">\n'
+	'\t\t<ClCompile>\n'
+	'\t\t\t<PreprocessorDefinitions>NDEBUG;%(PreprocessorDefinitions)</PreprocessorDefinitions>\n'
+	'\t\t</ClCompile>\n'
+	'\t</ItemDefinitionGroup>\n')
+
+vcxprojHLSLSettings = (
+	'\t\t\t<VariableName>g_DisplayDirectX8BitPS</VariableName>\n'
+	'\t\t\t<TargetProfile>ps_2_0</TargetProfile>\n'
+	'\t\t\t<ObjectFileName>%(RootDir)%(Directory)%(FileName).h</ObjectFileName>\n'
+	'\t\t</HLSL>\n')
+
+vcxprojFiltersHeader = (
+	b'<?xml version="1.0" encoding="utf-8"?>\n'
+	b'<Project ToolsVersion="4.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">\n'
+	b'\t<ItemGroup>\n')
+
+vcxprojFooter = (
+	'\t<Import Project="$(VCTargetsPath)\\Microsoft.Cpp.targets" />\n'
+	'\t<ImportGroup Label="ExtensionTargets" />\n'
+	'</Project>\n')
 
-		# Use this tree to play back all the data
-		dumptreevs2005(2,'',tree,fp,groups)
-		fp.write('\t</Files>\n')
-		
-	fp.write('</VisualStudioProject>\n')
-	fp.close()
-		
-	return 0
-	
 #
 # Create the solution and project file for visual studio 2010
 #
 
 def createvs2010solution(solution):
 	
-	error,projectfilename = createslnfile(solution)
+	error,projectfilename,solutionuuid = createslnfile(solution)
 	if error!=0:
 		return error
 		
@@ -1057,149 +996,129 @@ def createvs2010solution(solution):
 	
 	codefiles,includedirectories = getfilelist(solution)
 	platformcode = getplatformcode(solution.platform)
-	solutionuuid = str(uuid.uuid3(uuid.NAMESPACE_DNS,str(projectfilename))).upper()
+	vsplatforms = getvsplatform(solution.platform)
 	projectpathname = os.path.join(solution.workingDir,projectfilename + '.vcxproj')
-	fp = open(projectpathname,'w')
+	output = []
 	
 	#
 	# Save off the xml header
 	#
 	
-	fp.write('<?xml version="1.0" encoding="utf-8"?>\n')
-	fp.write('<Project DefaultTargets="Build" ToolsVersion="4.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">\n')
+	output.append(vcxprojHeader)
 
 	#
 	# nVidia Shield projects have a version header
 	#
 
 	if solution.platform=='shield':
-		fp.write('\t<PropertyGroup Label="NsightTegraProject">\n')
-		fp.write('\t\t<NsightTegraProjectRevisionNumber>4</NsightTegraProjectRevisionNumber>\n')
-		fp.write('\t</PropertyGroup>\n')
+		output.append(vcxprojShieldHeader)
 
 	#
 	# Write the project configurations
 	#
 
-	fp.write('\t<ItemGroup Label="ProjectConfigurations">\n')
+	output.append('\t<ItemGroup Label="ProjectConfigurations">\n')
 	for target in solution.configurations:
-		for vsplatform in getvsplatform(solution.platform):
-			token = target + '|' + vsplatform
-			fp.write('\t\t<ProjectConfiguration Include="' + token + '">\n')		
-			fp.write('\t\t\t<Configuration>' + target + '</Configuration>\n')
-			fp.write('\t\t\t<Platform>' + vsplatform + '</Platform>\n')
-			fp.write('\t\t</ProjectConfiguration>\n')
-	fp.write('\t</ItemGroup>\n')
+		for vsplatform in vsplatforms:
+			token = f'{target}|{vsplatform}'
+			output.append(f'\t\t<ProjectConfiguration Include="{token}">\n')
+			output.append(f'\t\t\t<Configuration>{target}</Configuration>\n')
+			output.append(f'\t\t\t<Platform>{vsplatform}</Platform>\n')
+			output.append('\t\t</ProjectConfiguration>\n')
+	output.append('\t</ItemGroup>\n')
 	
 	#
 	# Write the project globals
 	#
 	
-	fp.write('\t<PropertyGroup Label="Globals">\n')
-	fp.write('\t\t<ProjectName>' + solution.projectname + '</ProjectName>\n')
+	output.append('\t<PropertyGroup Label="Globals">\n')
+	output.append(f'\t\t<ProjectName>{solution.projectname}</ProjectName>\n')
 	if solution.finalfolder!=None:
 		final = converttowindowsslasheswithendslash(solution.finalfolder)
-		fp.write('\t\t<FinalFolder>' + final + '</FinalFolder>\n')
-	fp.write('\t\t<ProjectGuid>{' + solutionuuid + '}</ProjectGuid>\n')
-	fp.write('\t</PropertyGroup>\n')	
+		output.append(f'\t\t<FinalFolder>{final}</FinalFolder>\n')
+	output.append(f'\t\t<ProjectGuid>{{{solutionuuid}}}</ProjectGuid>\n')
+	output.append('\t</PropertyGroup>\n')	
 	
 	#
 	# Add in the project includes
 	#
 
-	fp.write('\t<Import Project="$(VCTargetsPath)\\Microsoft.Cpp.Default.props" />\n')
 	if solution.kind=='library':
-		fp.write('\t<Import Project="$(SDKS)\\visualstudio\\burger.libv10.props" />\n')
+		output.append(vcxprojImportsLibrary)
 	elif solution.kind=='tool':
-		fp.write('\t<Import Project="$(SDKS)\\visualstudio\\burger.toolv10.props" />\n')
+		output.append(vcxprojImportsTool)
 	else:
-		fp.write('\t<Import Project="$(SDKS)\\visualstudio\\burger.gamev10.props" />\n')	
-	fp.write('\t<Import Project="$(VCTargetsPath)\\Microsoft.Cpp.props" />\n')
-	fp.write('\t<ImportGroup Label="ExtensionSettings" />\n')
-	fp.write('\t<ImportGroup Label="PropertySheets" />\n')
-	fp.write('\t<PropertyGroup Label="UserMacros" />\n')
+		output.append(vcxprojImportsGame)
 
 	#
 	# Insert compiler settings
 	#
 	
-	if len(includedirectories) or \
-		len(solution.includefolders) or \
-		len(solution.defines):
-		fp.write('\t<ItemDefinitionGroup>\n')
+	hasincludes = len(includedirectories)!=0 or len(solution.includefolders)!=0
+	hasdefines = len(solution.defines)!=0
+	if hasincludes or hasdefines:
+		output.append('\t<ItemDefinitionGroup>\n')
 		
 		#
 		# Handle global compiler defines
 		#
 		
-		if len(includedirectories) or \
-			len(solution.includefolders) or \
-			len(solution.defines):
-			fp.write('\t\t<ClCompile>\n')
-	
-			# Include directories
-			if len(includedirectories) or len(solution.includefolders):
-				fp.write('\t\t\t<AdditionalIncludeDirectories>')
-				for dir in includedirectories:
-					fp.write('$(ProjectDir)' + converttowindowsslashes(dir) + ';')
-				for dir in solution.includefolders:
-					fp.write(converttowindowsslashes(dir) + ';')
-				fp.write('%(AdditionalIncludeDirectories)</AdditionalIncludeDirectories>\n')
-
-			# Global defines
-			if len(solution.defines):
-				fp.write('\t\t\t<PreprocessorDefinitions>')
-				for define in solution.defines:
-					fp.write(define + ';')
-				fp.write('%(PreprocessorDefinitions)</PreprocessorDefinitions>\n')
-	
-			fp.write('\t\t</ClCompile>\n')
+		output.append('\t\t<ClCompile>\n')
+
+		# Include directories
+		if hasincludes:
+			output.append('\t\t\t<AdditionalIncludeDirectories>')
+			for dir in includedirectories:
+				output.append(f'$(ProjectDir){converttowindowsslashes(dir)};')
+			for dir in solution.includefolders:
+				output.append(f'{converttowindowsslashes(dir)};')
+			output.append('%(AdditionalIncludeDirectories)</AdditionalIncludeDirectories>\n')
+
+		# Global defines
+		if hasdefines:
+			output.append('\t\t\t<PreprocessorDefinitions>')
+			for define in solution.defines:
+				output.append(f'{define};')
+			output.append('%(PreprocessorDefinitions)</PreprocessorDefinitions>\n')
+
+		output.append('\t\t</ClCompile>\n')
 
 		#
 		# Handle global linker defines
 		#
 		
 		if len(solution.includefolders):
-			fp.write('\t\t<Link>\n')
+			output.append('\t\t<Link>\n')
 	
 			# Include directories
-			if len(solution.includefolders):
-				fp.write('\t\t\t<AdditionalLibraryDirectories>')
-				for dir in solution.includefolders:
-					fp.write(converttowindowsslashes(dir) + ';')
-				fp.write('%(AdditionalLibraryDirectories)</AdditionalLibraryDirectories>\n')
+			output.append('\t\t\t<AdditionalLibraryDirectories>')
+			for dir in solution.includefolders:
+				output.append(f'{converttowindowsslashes(dir)};')
+			output.append('%(AdditionalLibraryDirectories)</AdditionalLibraryDirectories>\n')
 
-			fp.write('\t\t</Link>\n')
+			output.append('\t\t</Link>\n')
 
-		fp.write('\t</ItemDefinitionGroup>\n')
+		output.append('\t</ItemDefinitionGroup>\n')
 
 	#
 	# This is needed for the PS3 and PS4 targets :(
 	#
 	
 	if platformcode=='ps3' or platformcode=='ps4':
-		fp.write('\t<ItemDefinitionGroup Condition="\'$(BurgerConfiguration)\'!=\'Release\'">\n')
-		fp.write('\t\t<ClCompile>\n')
-		fp.write('\t\t\t<PreprocessorDefinitions>_DEBUG;%(PreprocessorDefinitions)</PreprocessorDefinitions>\n')
-		fp.write('\t\t</ClCompile>\n')
-		fp.write('\t</ItemDefinitionGroup>\n')
-		fp.write('\t<ItemDefinitionGroup Condition="\'$(BurgerConfiguration)\'==\'Release\'">\n')
-		fp.write('\t\t<ClCompile>\n')
-		fp.write('\t\t\t<PreprocessorDefinitions>NDEBUG;%(PreprocessorDefinitions)</PreprocessorDefinitions>\n')
-		fp.write('\t\t</ClCompile>\n')
-		fp.write('\t</ItemDefinitionGroup>\n')
+		output.append(vcxprojSonyDefines)
 
 	#
 	# Insert the source files
 	#
 	
-	listh = pickfromfilelist(codefiles,'h')
-	listcpp = pickfromfilelist(codefiles,'cpp')
+	buckets = bucketfilelist(codefiles)
+	listh = buckets.get('h',[])
+	listcpp = buckets.get('cpp',[])
 	listwindowsresource = []
 	listhlsl = []
 	if platformcode=='win':
-		listwindowsresource = pickfromfilelist(codefiles,'windowsresource')
-		listhlsl = pickfromfilelist(codefiles,'hlsl')
+		listwindowsresource = buckets.get('windowsresource',[])
+		listhlsl = buckets.get('hlsl',[])
 
 	#
 	# Any source files for the item groups?
@@ -1210,102 +1129,74 @@ def createvs2010solution(solution):
 		len(listwindowsresource) or \
 		len(listhlsl):
 
-		fp.write('\t<ItemGroup>\n')
+		output.append('\t<ItemGroup>\n')
 		for item in listh:
-			fp.write('\t\t<ClInclude Include="' + converttowindowsslashes(item.filename) + '" />\n')
+			output.append(f'\t\t<ClInclude Include="{item.winname}" />\n')
 		for item in listcpp:
-			fp.write('\t\t<ClCompile Include="' + converttowindowsslashes(item.filename) + '" />\n')
+			output.append(f'\t\t<ClCompile Include="{item.winname}" />\n')
 		for item in listwindowsresource:
-			fp.write('\t\t<ResourceCompile Include="' + converttowindowsslashes(item.filename) + '" />\n')
+			output.append(f'\t\t<ResourceCompile Include="{item.winname}" />\n')
 		for item in listhlsl:
-			fp.write('\t\t<HLSL Include="' + converttowindowsslashes(item.filename) + '">\n')
-			fp.write('\t\t\t<VariableName>g_DisplayDirectX8BitPS</VariableName>\n')
-			fp.write('\t\t\t<TargetProfile>ps_2_0</TargetProfile>\n')
-			fp.write('\t\t\t<ObjectFileName>%(RootDir)%(Directory)%(FileName).h</ObjectFileName>\n')
-			fp.write('\t\t</HLSL>\n')
-		fp.write('\t</ItemGroup>\n')	
+			output.append(f'\t\t<HLSL Include="{item.winname}">\n')
+			output.append(vcxprojHLSLSettings)
+		output.append('\t</ItemGroup>\n')	
 	
 	#
 	# Close up the project file!
 	#
 	
-	fp.write('\t<Import Project="$(VCTargetsPath)\Microsoft.Cpp.targets" />\n')
-	fp.write('\t<ImportGroup Label="ExtensionTargets" />\n')
-	fp.write('</Project>\n')
-	fp.close()
+	output.append(vcxprojFooter)
+	
+	#
+	# Write it out in one pass as UTF-8
+	#
+	
+	savefile(projectpathname,output)
 
 	#
 	# Is there need for a filter file? (Only for Visual Studio 2010 and up)
+	# Build it in memory so it's only created if there are any groups
 	#
 	
-	# 
-	# Create the filter filename
-	#
-		
-	filterpathname = os.path.join(solution.workingDir,projectfilename + '.vcxproj.filters')
-	fp = open(filterpathname,'w')
-		
+	output = []
+	groupset = set()
+
+	for tag,items in (('ClInclude',listh),('ClCompile',listcpp),('ResourceCompile',listwindowsresource),('HLSL',listhlsl)):
+		for item in items:
+			groupname = item.groupname
+			if groupname!='':
+				output.append(f'\t\t<{tag} Include="{item.winname}">\n\t\t\t<Filter>{groupname}</Filter>\n\t\t</{tag}>\n')
+				groupset.add(groupname)
+	
 	#
-	# Stock header
+	# Filters weren't needed at all? Don't create the file
 	#
-		
-	fp.write('<?xml version="1.0" encoding="utf-8"?>\n')
-	fp.write('<Project ToolsVersion="4.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">\n')
-
-	groups = []
-	fp.write('\t<ItemGroup>\n')
-
-	for item in listh:
-		groupname = converttowindowsslashes(extractgroupname(item.filename))
-		if groupname!='':
-			fp.write('\t\t<ClInclude Include="' + converttowindowsslashes(item.filename) + '">\n')
-			fp.write('\t\t\t<Filter>' + groupname + '</Filter>\n')
-			groups.append(groupname)
-			fp.write('\t\t</ClInclude>\n')
-
-	for item in listcpp:
-		groupname = converttowindowsslashes(extractgroupname(item.filename))
-		if groupname!='':
-			fp.write('\t\t<ClCompile Include="' + converttowindowsslashes(item.filename) + '">\n')
-			fp.write('\t\t\t<Filter>' + groupname + '</Filter>\n')
-			groups.append(groupname)
-			fp.write('\t\t</ClCompile>\n')
-
-	for item in listwindowsresource:
-		groupname = converttowindowsslashes(extractgroupname(item.filename))
-		if groupname!='':
-			fp.write('\t\t<ResourceCompile Include="' + converttowindowsslashes(item.filename) + '">\n')
-			fp.write('\t\t\t<Filter>' + groupname + '</Filter>\n')
-			groups.append(groupname)
-			fp.write('\t\t</ResourceCompile>\n')
-
-	for item in listhlsl:
-		groupname = converttowindowsslashes(extractgroupname(item.filename))
-		if groupname!='':
-			fp.write('\t\t<HLSL Include="' + converttowindowsslashes(item.filename) + '">\n')
-			fp.write('\t\t\t<Filter>' + groupname + '</Filter>\n')
-			groups.append(groupname)
-			fp.write('\t\t</HLSL>\n')
-	
-	groupset = set(groups)
+	
+	filterpathname = os.path.join(solution.workingDir,projectfilename + '.vcxproj.filters')
 	if len(groupset):
-		for group in groupset:
-			group = converttowindowsslashes(group)
-			fp.write('\t\t<Filter Include="' + group + '">\n')
+		for group in sorted(groupset):
 			groupuuid = str(uuid.uuid3(uuid.NAMESPACE_DNS,str(projectfilename + group))).upper()
-			fp.write('\t\t\t<UniqueIdentifier>{' + groupuuid + '}</UniqueIdentifier>\n')
-			fp.write('\t\t</Filter>\n')
+			output.append(f'\t\t<Filter Include="{group}">\n\t\t\t<UniqueIdentifier>{{{groupuuid}}}</UniqueIdentifier>\n\t\t</Filter>\n')
 
-	fp.write('\t</ItemGroup>\n')
-	fp.write('</Project>\n')
-	fp.close()
+		output.append('\t</ItemGroup>\n')
+		output.append('</Project>\n')
+
+		# 
+		# Create the filter file in one pass as UTF-8,
+		# the stock header goes first
+		#
+		
+		savefile(filterpathname,output,vcxprojFiltersHeader)
 	
 	#
-	# Uh oh, filters weren't needed at all!
+	# Remove a filter file left over from an earlier run
 	#
 	
-	if len(groupset)==0:
-		os.remove(filterpathname)
+	else:
+		try:
+			os.remove(filterpathname)
+		except FileNotFoundError:
+			pass
 			
 	return 0
 
@@ -1317,16 +1208,24 @@ def createvs2010solution(solution):
 #                                 #
 ###################################		
 
+#
+# Hashes already created by xcodeuuid, the same
+# strings are hashed over and over for groups
+#
+
+xcodeUuidCache = dict()
+
 #
 # Given a string, create a 96 bit unique hash for XCode
 #
 
 def xcodeuuid(input):
-	input = hashlib.md5(str(input).replace('/','\\')).hexdigest()
-	input = input.upper()
-	# Take the hash string and only use the top 96 bits
-	input = input[0:24]
-	return input
+	result = xcodeUuidCache.get(input)
+	if result is None:
+		# Take the hash string and only use the top 96 bits
+		result = hashlib.md5(input.replace('/','\\').encode('utf-8')).hexdigest()[0:24].upper()
+		xcodeUuidCache[input] = result
+	return result
 
 #
 # Dump out a recursive tree of files to reconstruct a
@@ -1341,7 +1240,7 @@ def dumptreevsxcode(string,entry,xcodepbxgroups,groups):
 		if string=='':
 			merged = item
 		else:
-			merged = string + '/' + item
+			merged = f'{string}/{item}'
 		if type(key) is dict:
 			dumptreevsxcode(merged,key,xcodepbxgroups,groups)
 	
@@ -1349,7 +1248,7 @@ def dumptreevsxcode(string,entry,xcodepbxgroups,groups):
 		return children
 		
 	if string in groups:
-		sortlist = sorted(groups[string],cmp=lambda x,y: cmp(converttolinuxslashes(x.filename),converttolinuxslashes(y.filename)))
+		sortlist = sorted(groups[string],key=operator.attrgetter('filename'))
 		path = converttolinuxslashes(sortlist[0].filename)
 	else:
 		sortlist = []
@@ -1366,22 +1265,138 @@ def dumptreevsxcode(string,entry,xcodepbxgroups,groups):
 		path = path[0:index]
 
 	uuid = xcodeuuid('PBXGroup!' + base)
-	out = '\t\t' + uuid + ' /* ' + base + ' */ = {\n' + \
-		'\t\t\tisa = PBXGroup;\n' + \
-		'\t\t\tchildren = (\n'
+	output = [f'\t\t{uuid} /* {base} */ = {{\n\t\t\tisa = PBXGroup;\n\t\t\tchildren = (\n']
 	for item in children:
-		out = out + '\t\t\t\t' +  xcodeuuid('PBXGroup!' + item) + ' /* ' + item + ' */,\n'
+		output.append(f'\t\t\t\t{xcodeuuid("PBXGroup!" + item)} /* {item} */,\n')
 	for item in sortlist:
-		basename = os.path.basename(item.filename)
-		out = out + '\t\t\t\t' + item.uuid + ' /* ' + basename + ' */,\n'
-	out = out + '\t\t\t);\n' + \
-		'\t\t\tname = ' + base + ';\n' + \
-		'\t\t\tpath = ' + path + ';\n' + \
-		'\t\t\tsourceTree = SOURCE_ROOT;\n' + \
-		'\t\t};\n'
-	xcodepbxgroups.append([uuid,out])
+		output.append(f'\t\t\t\t{item.uuid} /* {item.basename} */,\n')
+	output.append(f'\t\t\t);\n\t\t\tname = {base};\n\t\t\tpath = {path};\n\t\t\tsourceTree = SOURCE_ROOT;\n\t\t}};\n')
+	xcodepbxgroups.append([uuid,''.join(output)])
 	return []
 	
+#
+# The XCode header, the archive version and
+# classes are always present in an XCode file
+#
+# objectVersion
+# 42 = XCode 2.4
+# 44 = XCode 3.0
+# 45 = XCode 3.1
+# 46 = XCode 3.2
+#
+
+pbxprojHeader = (
+	'// !$*UTF8*$!\n'
+	'{\n'
+	'\tarchiveVersion = 1;\n'
+	'\tclasses = {\n'
+	'\t};\n'
+	'\tobjectVersion = 45;\n'
+	'\tobjects = {\n\n')
+
+#
+# Fixed shape sections of the XCode project, filled in with
+# the uuids and names of the project being written
+#
+
+pbxFrameworksBuildPhaseTemplate = (
+	'/* Begin PBXFrameworksBuildPhase section */\n'
+	'\t\t%(uuid)s /* Frameworks */ = {\n'
+	'\t\t\tisa = PBXFrameworksBuildPhase;\n'
+	'\t\t\tbuildActionMask = 2147483647;\n'
+	'\t\t\tfiles = (\n'
+	'%(files)s'
+	'\t\t\t);\n'
+	'\t\t\trunOnlyForDeploymentPostprocessing = 0;\n'
+	'\t\t};\n'
+	'/* End PBXFrameworksBuildPhase section */\n\n')
+
+pbxNativeTargetTemplate = (
+	'/* Begin PBXNativeTarget section */\n'
+	'\t\t%(uuid)s /* %(projectnamecode)s */ = {\n'
+	'\t\t\tisa = PBXNativeTarget;\n'
+	'\t\t\tbuildConfigurationList = %(configlistuuid)s /* Build configuration list for PBXNativeTarget "%(projectnamecode)s" */;\n'
+	'\t\t\tbuildPhases = (\n'
+	'\t\t\t\t%(headersuuid)s /* Headers */,\n'
+	'\t\t\t\t%(sourcesuuid)s /* Sources */,\n'
+	'\t\t\t\t%(frameworksuuid)s /* Frameworks */,\n'
+	'%(shellscript)s'
+	'\t\t\t);\n'
+	'\t\t\tbuildRules = (\n'
+	'\t\t\t);\n'
+	'\t\t\tdependencies = (\n'
+	'\t\t\t);\n'
+	'\t\t\tname = %(name)s;\n'
+	'\t\t\tproductName = %(projectname)s;\n'
+	'\t\t\tproductReference = %(outputuuid)s /* %(outputfilename)s */;\n'
+	'\t\t\tproductType = "com.apple.product-type.%(producttype)s";\n'
+	'\t\t};\n'
+	'/* End PBXNativeTarget section */\n\n')
+
+pbxProjectTemplate = (
+	'/* Begin PBXProject section */\n'
+	'\t\t%(uuid)s /* Project object */ = {\n'
+	'\t\t\tisa = PBXProject;\n'
+	'\t\t\tattributes = {\n'
+	'\t\t\t\tBuildIndependentTargetsInParallel = YES;\n'
+	'\t\t\t};\n'
+	'\t\t\tbuildConfigurationList = %(configlistuuid)s /* Build configuration list for PBXProject "%(projectnamecode)s" */;\n'
+	'\t\t\tcompatibilityVersion = "Xcode 3.1";\n'
+	'%(developmentregion)s'
+	'\t\t\thasScannedForEncodings = 1;\n'
+	'\t\t\tknownRegions = (\n'
+	'\t\t\t\ten,\n'
+	'\t\t\t);\n'
+	'\t\t\tmainGroup = %(maingroupuuid)s /* %(projectname)s */;\n'
+	'\t\t\tprojectDirPath = "";\n'
+	'\t\t\tprojectRoot = "";\n'
+	'\t\t\ttargets = (\n'
+	'\t\t\t\t%(targetuuid)s /* %(projectnamecode)s */,\n'
+	'\t\t\t);\n'
+	'\t\t};\n'
+	'/* End PBXProject section */\n\n')
+
+# %(finalfolder)s is used as is in outputPaths, %(shellfolder)s
+# has the $() macros changed to the ${} form for the shell script
+pbxShellScriptTemplate = (
+	'/* Begin PBXShellScriptBuildPhase section */\n'
+	'\t\t%%(uuid)s /* ShellScript */ = {\n'
+	'\t\t\tisa = PBXShellScriptBuildPhase;\n'
+	'\t\t\tbuildActionMask = 2147483647;\n'
+	'\t\t\tfiles = (\n'
+	'\t\t\t);\n'
+	'\t\t\tinputPaths = (\n'
+	'\t\t\t\t"$(CONFIGURATION_BUILD_DIR)/${EXECUTABLE_NAME}",\n'
+	'\t\t\t);\n'
+	'\t\t\toutputPaths = (\n'
+	'\t\t\t\t"%%(finalfolder)s${%(output)s}",\n'
+	'\t\t\t);\n'
+	'\t\t\trunOnlyForDeploymentPostprocessing = 0;\n'
+	'\t\t\tshellPath = /bin/sh;\n'
+	'\t\t\tshellScript = "%(script)s";\n'
+	'\t\t\tshowEnvVarsInLog = 0;\n'
+	'\t\t};\n'
+	'/* End PBXShellScriptBuildPhase section */\n\n')
+pbxShellScriptLibraryTemplate = pbxShellScriptTemplate % {
+	'output':'FINAL_OUTPUT',
+	'script':'${SDKS}/macosx/bin/p4 edit %(shellfolder)s${FINAL_OUTPUT}\\n'
+		'${CP} ${CONFIGURATION_BUILD_DIR}/${EXECUTABLE_NAME} %(shellfolder)s${FINAL_OUTPUT}\\n\\n'}
+pbxShellScriptToolTemplate = pbxShellScriptTemplate % {
+	'output':'PRODUCT_NAME',
+	'script':'if [ \\"${CONFIGURATION}\\" == \\"Release\\" ]; then\\n'
+		'${SDKS}/macosx/bin/p4 edit %(shellfolder)s${PRODUCT_NAME}\\n'
+		'${CP} ${CONFIGURATION_BUILD_DIR}/${EXECUTABLE_NAME} %(shellfolder)s${PRODUCT_NAME}\\nfi\\n'}
+
+xcConfigurationListTemplate = (
+	'\t\t%(uuid)s /* Build configuration list for %(isa)s "%(projectnamecode)s" */ = {\n'
+	'\t\t\tisa = XCConfigurationList;\n'
+	'\t\t\tbuildConfigurations = (\n'
+	'%(configurations)s'
+	'\t\t\t);\n'
+	'\t\t\tdefaultConfigurationIsVisible = 0;\n'
+	'\t\t\tdefaultConfigurationName = %(defaultconfiguration)s;\n'
+	'\t\t};\n')
+
 #
 # Create a project file for XCode version 3.??
 #
@@ -1404,7 +1419,7 @@ def createxcodesolution(solution,xcodeversion):
 	# Sort the file names
 	#
 	
-	codefiles = sorted(codefiles,cmp=lambda x,y: cmp(x.filename,y.filename))
+	codefiles = sorted(codefiles,key=operator.attrgetter('filename'))
 
 	#
 	# Determine the ide and target type for the final file name
@@ -1443,38 +1458,19 @@ def createxcodesolution(solution,xcodeversion):
 		configfilename = 'burger.toolxcoosx.xcconfig'
 	configfileuuid = xcodeuuid(configfilename)
 	
-	fp = open(projectfilename,'w')
+	output = []
 	
 	#
 	# Write the XCode header
 	#
 	
-	fp.write('// !$*UTF8*$!\n')
-	fp.write('{\n')
-	
-	#
-	# Always present in an XCode file
-	#
-	
-	fp.write('\tarchiveVersion = 1;\n')
-	fp.write('\tclasses = {\n')
-	fp.write('\t};\n')
-	
-	#
-	# 42 = XCode 2.4
-	# 44 = XCode 3.0
-	# 45 = XCode 3.1
-	# 46 = XCode 3.2
-	#
-	
-	fp.write('\tobjectVersion = 45;\n')
-	fp.write('\tobjects = {\n\n')
+	output.append(pbxprojHeader)
 
 	#
 	# PBXBuildFile section
 	#
 	
-	fp.write('/* Begin PBXBuildFile section */\n')
+	output.append('/* Begin PBXBuildFile section */\n')
 
 	#
 	# Store the entire file list, however, only process types that
@@ -1491,23 +1487,27 @@ def createxcodesolution(solution,xcodeversion):
 			continue
 		item.uuid = xcodeuuid(item.filename)
 		item.typeuuid = xcodeuuid(item.filename + ':' + type)
+		item.basename = os.path.basename(item.filename)
 		toprocess.append(item)
 		
+	frameworkitems = []
 	for framework in frameworks:
 		item = SourceFile()
 		item.filename = framework
 		item.type = 'frameworks'
 		item.uuid = xcodeuuid(item.filename)
 		item.typeuuid = xcodeuuid(item.filename+':Frameworks')
+		item.basename = os.path.basename(item.filename)
+		frameworkitems.append(item)
 		toprocess.append(item)
 	
 	#
 	# For reasons only Apple knows, it's sorted by the file type uuid
 	#
 	
-	codefiles = sorted(toprocess,cmp=lambda x,y: cmp(x.typeuuid,y.typeuuid))
+	codefiles = sorted(toprocess,key=operator.attrgetter('typeuuid'))
 	for item in codefiles:
-		basename = os.path.basename(item.filename)
+		basename = item.basename
 		if item.type == 'cpp':
 			type = 'Sources'
 		elif item.type == 'frameworks':
@@ -1515,20 +1515,21 @@ def createxcodesolution(solution,xcodeversion):
 		else:
 		#elif item.type == 'h':
 			type = 'Headers'
-		fp.write('\t\t' + item.typeuuid + ' /* ' + basename + ' in ' + type + ' */ = {isa = PBXBuildFile; fileRef = ' + item.uuid + ' /* ' + basename + ' */; };\n')
+		output.append(f'\t\t{item.typeuuid} /* {basename} in {type} */ = {{isa = PBXBuildFile; fileRef = {item.uuid} /* {basename} */; }};\n')
 		
-	fp.write('/* End PBXBuildFile section */\n\n')
+	output.append('/* End PBXBuildFile section */\n\n')
 	
 	#
 	# PBXFileReference
 	#
 	
-	fp.write('/* Begin PBXFileReference section */\n')
+	output.append('/* Begin PBXFileReference section */\n')
 	
 	toprocess = codefiles
 	entry1 = SourceFile()
 	entry1.filename = configfilename
 	entry1.uuid = configfileuuid
+	entry1.basename = os.path.basename(configfilename)
 	entry1.type = 'text.xcconfig'
 	toprocess.append(entry1)
 	
@@ -1538,7 +1539,7 @@ def createxcodesolution(solution,xcodeversion):
 	
 	entry2 = SourceFile()
 	if solution.kind=='library':
-		outputfilename = 'libburgerbase' + idecode + 'osx.a'
+		outputfilename = f'libburgerbase{idecode}osx.a'
 		entry2.type = 'lib'
 	else:
 		outputfilename = solution.projectname
@@ -1547,30 +1548,31 @@ def createxcodesolution(solution,xcodeversion):
 	outputuuid = xcodeuuid(outputfilename + ':' + projectnamecode)
 	entry2.filename = outputfilename
 	entry2.uuid = outputuuid
+	entry2.basename = os.path.basename(outputfilename)
 	toprocess.append(entry2)	
 
-	toprocess = sorted(toprocess,cmp=lambda x,y: cmp(x.uuid,y.uuid))
+	toprocess = sorted(toprocess,key=operator.attrgetter('uuid'))
 	for item in toprocess:
-		basename = os.path.basename(item.filename)
+		basename = item.basename
 		if item.type == 'lib':
-			fp.write('\t\t' + item.uuid + ' /* ' + basename + ' */ = {isa = PBXFileReference; explicitFileType = archive.ar; includeInIndex = 0; path = ' + basename + '; sourceTree = BUILT_PRODUCTS_DIR; };\n')
+			output.append(f'\t\t{item.uuid} /* {basename} */ = {{isa = PBXFileReference; explicitFileType = archive.ar; includeInIndex = 0; path = {basename}; sourceTree = BUILT_PRODUCTS_DIR; }};\n')
 			continue
 		elif item.type == 'exe':
-			fp.write('\t\t' + item.uuid + ' /* ' + basename + ' */ = {isa = PBXFileReference; explicitFileType = "compiled.mach-o.executable"; includeInIndex = 0; path = ' + basename + '; sourceTree = BUILT_PRODUCTS_DIR; };\n')
+			output.append(f'\t\t{item.uuid} /* {basename} */ = {{isa = PBXFileReference; explicitFileType = "compiled.mach-o.executable"; includeInIndex = 0; path = {basename}; sourceTree = BUILT_PRODUCTS_DIR; }};\n')
 			continue
 		elif item.type == 'frameworks':
-			fp.write('\t\t' + item.uuid + ' /* ' + basename + ' */ = {isa = PBXFileReference; lastKnownFileType = wrapper.framework; name = ' + basename + '; path = System/Library/Frameworks/' + basename + '; sourceTree = SDKROOT; };\n')
+			output.append(f'\t\t{item.uuid} /* {basename} */ = {{isa = PBXFileReference; lastKnownFileType = wrapper.framework; name = {basename}; path = System/Library/Frameworks/{basename}; sourceTree = SDKROOT; }};\n')
 			continue
 		elif item.type == 'text.xcconfig':
-			fp.write('\t\t' + item.uuid + ' /* ' + basename + ' */ = {isa = PBXFileReference; fileEncoding = 4; lastKnownFileType = ' + item.type + '; name = ' + basename + '; path = xcode/' + basename + '; sourceTree = SDKS; };\n')
+			output.append(f'\t\t{item.uuid} /* {basename} */ = {{isa = PBXFileReference; fileEncoding = 4; lastKnownFileType = {item.type}; name = {basename}; path = xcode/{basename}; sourceTree = SDKS; }};\n')
 			continue
 		elif item.type == 'cpp':
 			type = 'sourcecode.cpp.cpp'
 		else:
 			type = 'sourcecode.c.h'
-		fp.write('\t\t' + item.uuid + ' /* ' + basename + ' */ = {isa = PBXFileReference; fileEncoding = 4; lastKnownFileType = ' + type + '; name = ' + basename + '; path = ' + item.filename + '; sourceTree = SOURCE_ROOT; };\n')
+		output.append(f'\t\t{item.uuid} /* {basename} */ = {{isa = PBXFileReference; fileEncoding = 4; lastKnownFileType = {type}; name = {basename}; path = {item.filename}; sourceTree = SOURCE_ROOT; }};\n')
 
-	fp.write('/* End PBXFileReference section */\n\n')
+	output.append('/* End PBXFileReference section */\n\n')
 	
 	toprocess.remove(entry1)
 	toprocess.remove(entry2)
@@ -1579,17 +1581,9 @@ def createxcodesolution(solution,xcodeversion):
 	# PBXFrameworksBuildPhase
 	#
 	
-	fp.write('/* Begin PBXFrameworksBuildPhase section */\n')
-	fp.write('\t\t' + frameworksuuid + ' /* Frameworks */ = {\n')
-	fp.write('\t\t\tisa = PBXFrameworksBuildPhase;\n')
-	fp.write('\t\t\tbuildActionMask = 2147483647;\n')
-	fp.write('\t\t\tfiles = (\n')
-	for framework in frameworks:
-		fp.write('\t\t\t\t' + xcodeuuid(framework+':Frameworks') + ' /* ' + framework + ' in Frameworks */,\n')	
-	fp.write('\t\t\t);\n')
-	fp.write('\t\t\trunOnlyForDeploymentPostprocessing = 0;\n')
-	fp.write('\t\t};\n')
-	fp.write('/* End PBXFrameworksBuildPhase section */\n\n')
+	output.append(pbxFrameworksBuildPhaseTemplate % {
+		'uuid':frameworksuuid,
+		'files':''.join([f'\t\t\t\t{item.typeuuid} /* {item.filename} in Frameworks */,\n' for item in frameworkitems])})
 	
 	#
 	# PBXGroup
@@ -1602,13 +1596,8 @@ def createxcodesolution(solution,xcodeversion):
 		
 	groups = dict()
 	for item in codefiles:
-		groupname = extractgroupname(item.filename)
 		# Put each filename in its proper group
-		if groupname in groups:
-			groups[groupname].append(item)
-		else:
-			# New group!
-			groups[groupname] = [item]
+		groups.setdefault(extractgroupname(item.filename),[]).append(item)
 		
 	#
 	# Create a recursive tree in order to store out the file list
@@ -1616,33 +1605,25 @@ def createxcodesolution(solution,xcodeversion):
 
 	tree = dict()
 	for group in groups:
-		#
-		# Get the depth of the tree needed
-		#
-		parts = group.split('/')
 		next = tree
 		#
-		# Iterate over every part
+		# Iterate over every part, stepping into the tree
 		#
-		for x in xrange(len(parts)):
-			# Already declared?
-			if not parts[x] in next:
-				next[parts[x]] = dict()
-			# Step into the tree
-			next = next[parts[x]]
+		for part in group.split('/'):
+			next = next.setdefault(part,dict())
 
 	# Use this tree to play back all the data
 
 	xcodepbxgroups = []
 	productsuuid = '1AB674ADFE9D54B511CA2CBB'
 
-	out = '\t\t' + productsuuid + ' /* Products */ = {\n' + \
-		'\t\t\tisa = PBXGroup;\n' + \
-		'\t\t\tchildren = (\n' + \
-		'\t\t\t\t' + outputuuid + ' /* ' + outputfilename + ' */,\n' + \
-		'\t\t\t);\n' + \
-		'\t\t\tname = Products;\n' + \
-		'\t\t\tsourceTree = "<group>";\n' + \
+	out = f'\t\t{productsuuid} /* Products */ = {{\n' \
+		'\t\t\tisa = PBXGroup;\n' \
+		'\t\t\tchildren = (\n' \
+		f'\t\t\t\t{outputuuid} /* {outputfilename} */,\n' \
+		'\t\t\t);\n' \
+		'\t\t\tname = Products;\n' \
+		'\t\t\tsourceTree = "<group>";\n' \
 		'\t\t};\n'
 	xcodepbxgroups.append([productsuuid,out])
 
@@ -1653,169 +1634,127 @@ def createxcodesolution(solution,xcodeversion):
 	#
 	
 	if '' in groups:
-		sortlist = sorted(groups[''],cmp=lambda x,y: cmp(x.filename,y.filename))
+		sortlist = sorted(groups[''],key=operator.attrgetter('filename'))
 	else:
 		sortlist = []
 		
-	out = '\t\t' + projectnameuuid + ' /* ' + solution.projectname + ' */ = {\n' + \
-		'\t\t\tisa = PBXGroup;\n' + \
-		'\t\t\tchildren = (\n'
+	rootgroup = [f'\t\t{projectnameuuid} /* {solution.projectname} */ = {{\n\t\t\tisa = PBXGroup;\n\t\t\tchildren = (\n']
 	for item in list:
 		if item=='':
 			continue
-		out = out + '\t\t\t\t' +  xcodeuuid('PBXGroup!' + item) + ' /* ' + item + ' */,\n'
+		rootgroup.append(f'\t\t\t\t{xcodeuuid("PBXGroup!" + item)} /* {item} */,\n')
 	for item in sortlist:
 		if item.uuid==outputuuid:
 			continue
-		basename = os.path.basename(item.filename)
-		out = out + '\t\t\t\t' + item.uuid + ' /* ' + basename + ' */,\n'
-	out = out + '\t\t\t\t' + productsuuid + ' /* Products */,\n' + \
-		'\t\t\t);\n' + \
-		'\t\t\tname = ' + solution.projectname + ';\n' + \
-		'\t\t\tsourceTree = "<group>";\n' + \
-		'\t\t};\n'
-	xcodepbxgroups.append([projectnameuuid,out])
+		rootgroup.append(f'\t\t\t\t{item.uuid} /* {item.basename} */,\n')
+	rootgroup.append(f'\t\t\t\t{productsuuid} /* Products */,\n\t\t\t);\n\t\t\tname = {solution.projectname};\n\t\t\tsourceTree = "<group>";\n\t\t}};\n')
+	xcodepbxgroups.append([projectnameuuid,''.join(rootgroup)])
 	
 	# 
 	# Sort by UUID
 	#
 	
-	xcodepbxgroups = sorted(xcodepbxgroups,cmp=lambda x,y: cmp(x[0],y[0]))
+	xcodepbxgroups = sorted(xcodepbxgroups,key=operator.itemgetter(0))
 
-	fp.write('/* Begin PBXGroup section */\n')
+	output.append('/* Begin PBXGroup section */\n')
 	for xcpbxgroup in xcodepbxgroups:
-		fp.write(xcpbxgroup[1])
-	fp.write('/* End PBXGroup section */\n\n')
+		output.append(xcpbxgroup[1])
+	output.append('/* End PBXGroup section */\n\n')
 
 	#
 	# PBXHeadersBuildPhase
 	#
 	
-	fp.write('/* Begin PBXHeadersBuildPhase section */\n')
-	fp.write('\t\t' + headersuuid + ' /* Headers */ = {\n')
-	fp.write('\t\t\tisa = PBXHeadersBuildPhase;\n')
-	fp.write('\t\t\tbuildActionMask = 2147483647;\n')
-	fp.write('\t\t\tfiles = (\n')
-	codefiles = sorted(codefiles,cmp=lambda x,y: cmp(os.path.basename(x.filename),os.path.basename(y.filename)))
+	output.append('/* Begin PBXHeadersBuildPhase section */\n')
+	output.append(f'\t\t{headersuuid} /* Headers */ = {{\n')
+	output.append('\t\t\tisa = PBXHeadersBuildPhase;\n')
+	output.append('\t\t\tbuildActionMask = 2147483647;\n')
+	output.append('\t\t\tfiles = (\n')
+	codefiles = sorted(codefiles,key=operator.attrgetter('basename'))
 	for item in codefiles:
 		if item.type=='h':
-			basename = os.path.basename(item.filename)
-			fp.write('\t\t\t\t' + item.typeuuid + ' /* ' + basename + ' in Headers */,\n')
+			output.append(f'\t\t\t\t{item.typeuuid} /* {item.basename} in Headers */,\n')
 
-	fp.write('\t\t\t);\n')
-	fp.write('\t\t\trunOnlyForDeploymentPostprocessing = 0;\n')
-	fp.write('\t\t};\n')
-	fp.write('/* End PBXHeadersBuildPhase section */\n\n')
+	output.append('\t\t\t);\n')
+	output.append('\t\t\trunOnlyForDeploymentPostprocessing = 0;\n')
+	output.append('\t\t};\n')
+	output.append('/* End PBXHeadersBuildPhase section */\n\n')
 
 	#
 	# PBXNativeTarget
 	#
 
-	fp.write('/* Begin PBXNativeTarget section */\n')
-	fp.write('\t\t' + tonativetargetuuid + ' /* ' + projectnamecode + ' */ = {\n')
-	fp.write('\t\t\tisa = PBXNativeTarget;\n')
-	fp.write('\t\t\tbuildConfigurationList = ' + nativetargetuuid + ' /* Build configuration list for PBXNativeTarget "' + projectnamecode + '" */;\n')
-	fp.write('\t\t\tbuildPhases = (\n')
-	fp.write('\t\t\t\t' + headersuuid + ' /* Headers */,\n')
-	fp.write('\t\t\t\t' + sourcesuuid + ' /* Sources */,\n')
-	fp.write('\t\t\t\t' + frameworksuuid + ' /* Frameworks */,\n')
 	if solution.finalfolder!=None:
-		fp.write('\t\t\t\t' + shellscriptuuid + ' /* ShellScript */,\n')
-	fp.write('\t\t\t);\n')
-	fp.write('\t\t\tbuildRules = (\n')
-	fp.write('\t\t\t);\n')
-	fp.write('\t\t\tdependencies = (\n')
-	fp.write('\t\t\t);\n')
-	if solution.kind=='library':
-		fp.write('\t\t\tname = ' + projectnamecode + ';\n')
+		shellscriptphase = f'\t\t\t\t{shellscriptuuid} /* ShellScript */,\n'
 	else:
-		fp.write('\t\t\tname = ' + solution.projectname + ';\n')
-
-	fp.write('\t\t\tproductName = ' + solution.projectname + ';\n')
-	fp.write('\t\t\tproductReference = ' + outputuuid + ' /* ' + outputfilename + ' */;\n')
+		shellscriptphase = ''
 	if solution.kind=='library':
-		fp.write('\t\t\tproductType = "com.apple.product-type.library.static";\n')
+		targetname = projectnamecode
+		producttype = 'library.static'
 	else:
-		fp.write('\t\t\tproductType = "com.apple.product-type.tool";\n')
-	fp.write('\t\t};\n')
-	fp.write('/* End PBXNativeTarget section */\n\n')
+		targetname = solution.projectname
+		producttype = 'tool'
+	output.append(pbxNativeTargetTemplate % {
+		'uuid':tonativetargetuuid,
+		'projectnamecode':projectnamecode,
+		'configlistuuid':nativetargetuuid,
+		'headersuuid':headersuuid,
+		'sourcesuuid':sourcesuuid,
+		'frameworksuuid':frameworksuuid,
+		'shellscript':shellscriptphase,
+		'name':targetname,
+		'projectname':solution.projectname,
+		'outputuuid':outputuuid,
+		'outputfilename':outputfilename,
+		'producttype':producttype})
 
 	#
 	# PBXProject
 	#
 
-	fp.write('/* Begin PBXProject section */\n')
-	fp.write('\t\t' + rootuuid + ' /* Project object */ = {\n')
-	fp.write('\t\t\tisa = PBXProject;\n')
-	fp.write('\t\t\tattributes = {\n')
-	fp.write('\t\t\t\tBuildIndependentTargetsInParallel = YES;\n')
-	fp.write('\t\t\t};\n')
-	fp.write('\t\t\tbuildConfigurationList = ' + pbxprojectuuid + ' /* Build configuration list for PBXProject "' + projectnamecode + '" */;\n')
-	fp.write('\t\t\tcompatibilityVersion = "Xcode 3.1";\n')
 	if xcodeversion>3:
-		fp.write('\t\t\tdevelopmentRegion = English;\n')
-	fp.write('\t\t\thasScannedForEncodings = 1;\n')
-	fp.write('\t\t\tknownRegions = (\n')
-	fp.write('\t\t\t\ten,\n')
-	fp.write('\t\t\t);\n')
-	fp.write('\t\t\tmainGroup = ' + projectnameuuid + ' /* ' + solution.projectname + ' */;\n')
-	fp.write('\t\t\tprojectDirPath = "";\n')
-	fp.write('\t\t\tprojectRoot = "";\n')
-	fp.write('\t\t\ttargets = (\n')
-	fp.write('\t\t\t\t' + tonativetargetuuid + ' /* ' + projectnamecode + ' */,\n')
-	fp.write('\t\t\t);\n')
-	fp.write('\t\t};\n')
-	fp.write('/* End PBXProject section */\n\n')
+		developmentregion = '\t\t\tdevelopmentRegion = English;\n'
+	else:
+		developmentregion = ''
+	output.append(pbxProjectTemplate % {
+		'uuid':rootuuid,
+		'configlistuuid':pbxprojectuuid,
+		'projectnamecode':projectnamecode,
+		'developmentregion':developmentregion,
+		'maingroupuuid':projectnameuuid,
+		'projectname':solution.projectname,
+		'targetuuid':tonativetargetuuid})
 
 	#
 	# PBXShellScriptBuildPhase
 	#
 
 	if solution.finalfolder!=None:
-		fp.write('/* Begin PBXShellScriptBuildPhase section */\n')
-		fp.write('\t\t' + shellscriptuuid + ' /* ShellScript */ = {\n')
-		fp.write('\t\t\tisa = PBXShellScriptBuildPhase;\n')
-		fp.write('\t\t\tbuildActionMask = 2147483647;\n')
-		fp.write('\t\t\tfiles = (\n')
-		fp.write('\t\t\t);\n')
-		fp.write('\t\t\tinputPaths = (\n')
-		fp.write('\t\t\t\t"$(CONFIGURATION_BUILD_DIR)/${EXECUTABLE_NAME}",\n')
-		fp.write('\t\t\t);\n')
-		fp.write('\t\t\toutputPaths = (\n')
-		if solution.kind=='library':
-			fp.write('\t\t\t\t"' + solution.finalfolder + '${FINAL_OUTPUT}",\n')
-		else:
-			fp.write('\t\t\t\t"' + solution.finalfolder + '${PRODUCT_NAME}",\n')
-		fp.write('\t\t\t);\n')
-		fp.write('\t\t\trunOnlyForDeploymentPostprocessing = 0;\n')
-		fp.write('\t\t\tshellPath = /bin/sh;\n')
-		finalfolder = solution.finalfolder.replace('(','{')
-		finalfolder = finalfolder.replace(')','}')
 		if solution.kind=='library':
-			fp.write('\t\t\tshellScript = "${SDKS}/macosx/bin/p4 edit ' + finalfolder + '${FINAL_OUTPUT}\\n${CP} ${CONFIGURATION_BUILD_DIR}/${EXECUTABLE_NAME} ' + finalfolder + '${FINAL_OUTPUT}\\n\\n";\n')
+			shellscripttemplate = pbxShellScriptLibraryTemplate
 		else:
-			fp.write('\t\t\tshellScript = "if [ \\"${CONFIGURATION}\\" == \\"Release\\" ]; then\\n${SDKS}/macosx/bin/p4 edit ' + finalfolder + '${PRODUCT_NAME}\\n${CP} ${CONFIGURATION_BUILD_DIR}/${EXECUTABLE_NAME} ' + finalfolder + '${PRODUCT_NAME}\\nfi\\n";\n')
-		fp.write('\t\t\tshowEnvVarsInLog = 0;\n')
-		fp.write('\t\t};\n')
-		fp.write('/* End PBXShellScriptBuildPhase section */\n\n')
+			shellscripttemplate = pbxShellScriptToolTemplate
+		output.append(shellscripttemplate % {
+			'uuid':shellscriptuuid,
+			'finalfolder':solution.finalfolder,
+			'shellfolder':solution.finalfolder.replace('(','{').replace(')','}')})
 
 	#
 	# PBXSourcesBuildPhase
 	#
 
-	fp.write('/* Begin PBXSourcesBuildPhase section */\n')
-	fp.write('\t\t' + sourcesuuid + ' /* Sources */ = {\n')
-	fp.write('\t\t\tisa = PBXSourcesBuildPhase;\n')
-	fp.write('\t\t\tbuildActionMask = 2147483647;\n')
-	fp.write('\t\t\tfiles = (\n')
+	output.append('/* Begin PBXSourcesBuildPhase section */\n')
+	output.append(f'\t\t{sourcesuuid} /* Sources */ = {{\n')
+	output.append('\t\t\tisa = PBXSourcesBuildPhase;\n')
+	output.append('\t\t\tbuildActionMask = 2147483647;\n')
+	output.append('\t\t\tfiles = (\n')
 	for item in codefiles:
 		if item.type=='cpp':
-			basename = os.path.basename(item.filename)
-			fp.write('\t\t\t\t' + xcodeuuid(item.filename+':Sources') + ' /* ' + basename + ' in Sources */,\n')
-	fp.write('\t\t\t);\n')
-	fp.write('\t\t\trunOnlyForDeploymentPostprocessing = 0;\n')
-	fp.write('\t\t};\n')
-	fp.write('/* End PBXSourcesBuildPhase section */\n\n')
+			output.append(f'\t\t\t\t{item.typeuuid} /* {item.basename} in Sources */,\n')
+	output.append('\t\t\t);\n')
+	output.append('\t\t\trunOnlyForDeploymentPostprocessing = 0;\n')
+	output.append('\t\t};\n')
+	output.append('/* End PBXSourcesBuildPhase section */\n\n')
 
 	#
 	# XCBuildConfiguration
@@ -1824,23 +1763,23 @@ def createxcodesolution(solution,xcodeversion):
 	xcbuildconfigurations = []
 	for item in solution.configurations:
 		uuid = xcodeuuid('PBXNativeTarget' + item)
-		out = '\t\t' + uuid + ' /* ' + item + ' */ = {\n' + \
-		'\t\t\tisa = XCBuildConfiguration;\n'
-#		'\t\t\tbaseConfigurationReference = ' + configfileuuid + ' /* ' + configfilename + ' */;\n'
-		out = out + '\t\t\tbuildSettings = {\n' + \
-			'\t\t\t};\n' + \
-			'\t\t\tname = ' + item + ';\n' + \
-			'\t\t};\n'
+		out = (f'\t\t{uuid} /* {item} */ = {{\n'
+			'\t\t\tisa = XCBuildConfiguration;\n'
+#			f'\t\t\tbaseConfigurationReference = {configfileuuid} /* {configfilename} */;\n'
+			'\t\t\tbuildSettings = {\n'
+			'\t\t\t};\n'
+			f'\t\t\tname = {item};\n'
+			'\t\t};\n')
 		xcbuildconfigurations.append([uuid,out])
 
 	for item in solution.configurations:
 		uuid = xcodeuuid('PBXProject' + item)
-		out = '\t\t' + uuid + ' /* ' + item + ' */ = {\n' + \
-			'\t\t\tisa = XCBuildConfiguration;\n' + \
-			'\t\t\tbaseConfigurationReference = ' + configfileuuid + ' /* ' + configfilename + ' */;\n' + \
-			'\t\t\tbuildSettings = {\n' + \
-			'\t\t\t};\n' + \
-			'\t\t\tname = ' + item + ';\n' + \
+		out = f'\t\t{uuid} /* {item} */ = {{\n' \
+			'\t\t\tisa = XCBuildConfiguration;\n' \
+			f'\t\t\tbaseConfigurationReference = {configfileuuid} /* {configfilename} */;\n' \
+			'\t\t\tbuildSettings = {\n' \
+			'\t\t\t};\n' \
+			f'\t\t\tname = {item};\n' \
 			'\t\t};\n'
 		xcbuildconfigurations.append([uuid,out])
 
@@ -1848,12 +1787,12 @@ def createxcodesolution(solution,xcodeversion):
 	# Sort by UUID
 	#
 	
-	xcbuildconfigurations = sorted(xcbuildconfigurations,cmp=lambda x,y: cmp(x[0],y[0]))
+	xcbuildconfigurations = sorted(xcbuildconfigurations,key=operator.itemgetter(0))
 
-	fp.write('/* Begin XCBuildConfiguration section */\n')
+	output.append('/* Begin XCBuildConfiguration section */\n')
 	for xcbuildconfig in xcbuildconfigurations:
-		fp.write(xcbuildconfig[1])
-	fp.write('/* End XCBuildConfiguration section */\n\n')
+		output.append(xcbuildconfig[1])
+	output.append('/* End XCBuildConfiguration section */\n\n')
 
 	#
 	# XCConfigurationList
@@ -1864,72 +1803,307 @@ def createxcodesolution(solution,xcodeversion):
 	else:
 		defaultconfiguration = solution.configurations[0]
 		
-	fp.write('/* Begin XCConfigurationList section */\n')
-	fp.write('\t\t' + nativetargetuuid + ' /* Build configuration list for PBXNativeTarget "' + projectnamecode + '" */ = {\n')
-	fp.write('\t\t\tisa = XCConfigurationList;\n')
-	fp.write('\t\t\tbuildConfigurations = (\n')
-	for item in solution.configurations:
-		fp.write('\t\t\t\t' + xcodeuuid('PBXNativeTarget' + item) + ' /* ' + item + ' */,\n')
-	fp.write('\t\t\t);\n')
-	fp.write('\t\t\tdefaultConfigurationIsVisible = 0;\n')
-	fp.write('\t\t\tdefaultConfigurationName = ' + defaultconfiguration + ';\n')
-	fp.write('\t\t};\n')
-	fp.write('\t\t' + pbxprojectuuid + ' /* Build configuration list for PBXProject "' + projectnamecode + '" */ = {\n')
-	fp.write('\t\t\tisa = XCConfigurationList;\n')
-	fp.write('\t\t\tbuildConfigurations = (\n')
-	for item in solution.configurations:
-		fp.write('\t\t\t\t' + xcodeuuid('PBXProject' + item) + ' /* ' + item + ' */,\n')
-	fp.write('\t\t\t);\n')
-	fp.write('\t\t\tdefaultConfigurationIsVisible = 0;\n')
-	fp.write('\t\t\tdefaultConfigurationName = ' + defaultconfiguration + ';\n')
-	fp.write('\t\t};\n')
-	fp.write('/* End XCConfigurationList section */\n')
+	output.append('/* Begin XCConfigurationList section */\n')
+	for isa,uuid in (('PBXNativeTarget',nativetargetuuid),('PBXProject',pbxprojectuuid)):
+		output.append(xcConfigurationListTemplate % {
+			'uuid':uuid,
+			'isa':isa,
+			'projectnamecode':projectnamecode,
+			'configurations':''.join([f'\t\t\t\t{xcodeuuid(isa + item)} /* {item} */,\n' for item in solution.configurations]),
+			'defaultconfiguration':defaultconfiguration})
+	output.append('/* End XCConfigurationList section */\n')
 
 	#
 	# Close up the project file
 	#
 	
-	fp.write('\t};\n')
-	fp.write('\trootObject = ' + rootuuid + ' /* Project object */;\n')
-	fp.write('}\n')
+	output.append('\t};\n')
+	output.append(f'\trootObject = {rootuuid} /* Project object */;\n')
+	output.append('}\n')
+	
+	#
+	# Stream the pieces out in one call
+	#
+	
+	fp = open(projectfilename,'w',writeBufferSize,encoding='utf-8')
+	fp.writelines(output)
 	fp.close()
 	
 	return 0
 
 
+#
+# File entries in the CodeWarrior FILELIST, LINKORDER and GROUPLIST
+#
+
+codewarriorFileTemplate = (
+	'\t\t\t\t<FILE>\n'
+	'\t\t\t\t\t<PATHTYPE>Name</PATHTYPE>\n'
+	'\t\t\t\t\t<PATH>%(path)s</PATH>\n'
+	'\t\t\t\t\t<PATHFORMAT>Windows</PATHFORMAT>\n'
+	'\t\t\t\t\t<FILEKIND>%(kind)s</FILEKIND>\n'
+	'\t\t\t\t\t<FILEFLAGS>%(flags)s</FILEFLAGS>\n'
+	'\t\t\t\t</FILE>\n')
+
+codewarriorFileRefTemplate = (
+	'\t\t\t\t<FILEREF>\n'
+	'\t\t\t\t\t<PATHTYPE>Name</PATHTYPE>\n'
+	'\t\t\t\t\t<PATH>%s</PATH>\n'
+	'\t\t\t\t\t<PATHFORMAT>Windows</PATHFORMAT>\n'
+	'\t\t\t\t</FILEREF>\n')
+
+# %(tabs)s is the indent of the group the file is in
+codewarriorGroupFileRefTemplate = (
+	'%(tabs)s<FILEREF>\n'
+	'%(tabs)s\t<TARGETNAME>Win32 %(target)s</TARGETNAME>\n'
+	'%(tabs)s\t<PATHTYPE>Name</PATHTYPE>\n'
+	'%(tabs)s\t<PATH>%(path)s</PATH>\n'
+	'%(tabs)s\t<PATHFORMAT>Windows</PATHFORMAT>\n'
+	'%(tabs)s</FILEREF>\n')
+
 #
 # Dump out a recursive tree of files to reconstruct a
 # directory hiearchy for codewarrior
 #
 
-def dumptreecodewarrior(indent,string,entry,fp,groups):
-	for item in entry:
+def dumptreecodewarrior(indent,string,entry,output,groups):
+	# The tab prefix of each level is built once and carried on the stack
+	grouptabs = '\t'*indent
+	innertabs = grouptabs + '\t'
+	stack = [(grouptabs,innertabs,string,item,entry[item]) for item in reversed(list(entry))]
+	while stack:
+		grouptabs,innertabs,string,item,key = stack.pop()
+		if key is None:
+			output.append(f'{grouptabs}</GROUP>\n')
+			continue
 		if item!='':
-			fp.write('\t'*indent + '<GROUP><NAME>' + item + '</NAME>\n')
+			output.append(f'{grouptabs}<GROUP><NAME>{item}</NAME>\n')
 		if string=='':
 			merged = item
 		else:
-			merged = string + '\\' + item
+			merged = f'{string}\\{item}'
 		if merged in groups:
 			if item!='':
-				tabs = '\t'*(indent+1)
+				tabs = innertabs
 			else:
-				tabs = '\t'*indent
-			sortlist = sorted(groups[merged],cmp=lambda x,y: cmp(x,y))
-			for file in sortlist:
-				fp.write(tabs + '<FILEREF>\n')
-				fp.write(tabs + '\t<TARGETNAME>Win32 Release</TARGETNAME>\n')
-				fp.write(tabs + '\t<PATHTYPE>Name</PATHTYPE>\n')
-				fp.write(tabs + '\t<PATH>' + os.path.basename(file) + '</PATH>\n')
-				fp.write(tabs + '\t<PATHFORMAT>Windows</PATHFORMAT>\n')
-				fp.write(tabs + '</FILEREF>\n')
-				
-		key = entry[item]
-		if type(key) is dict:
-			dumptreecodewarrior(indent+1,merged,key,fp,groups)
+				tabs = grouptabs
+			sortlist = sorted(groups[merged])
+			output.append(''.join([codewarriorGroupFileRefTemplate % {'tabs':tabs,'target':'Release','path':ntpath.basename(file)} for file in sortlist]))
 		if item!='':
-			fp.write('\t'*indent + '</GROUP>\n')
+			stack.append((grouptabs,innertabs,string,item,None))
+		# Push the children so they come off the stack in order
+		if type(key) is dict:
+			childtabs = innertabs + '\t'
+			stack.extend([(innertabs,childtabs,merged,child,key[child]) for child in reversed(list(key))])
 			
+#
+# Fixed settings shared by every CodeWarrior target
+#
+
+# Operating system include folders, relative to SDKS and CodeWarrior
+codewarriorSearchPathTemplate = (
+	'\t\t\t\t\t<SETTING>\n'
+	'\t\t\t\t\t\t<SETTING><NAME>SearchPath</NAME>\n'
+	'\t\t\t\t\t\t\t<SETTING><NAME>Path</NAME><VALUE>%(path)s</VALUE></SETTING>\n'
+	'\t\t\t\t\t\t\t<SETTING><NAME>PathFormat</NAME><VALUE>Windows</VALUE></SETTING>\n'
+	'\t\t\t\t\t\t\t<SETTING><NAME>PathRoot</NAME><VALUE>%(root)s</VALUE></SETTING>\n'
+	'\t\t\t\t\t\t</SETTING>\n'
+	'\t\t\t\t\t\t<SETTING><NAME>Recursive</NAME><VALUE>%(recursive)s</VALUE></SETTING>\n'
+	'\t\t\t\t\t\t<SETTING><NAME>FrameworkPath</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t\t\t<SETTING><NAME>HostFlags</NAME><VALUE>All</VALUE></SETTING>\n'
+	'\t\t\t\t\t</SETTING>\n')
+codewarriorSystemSearchPaths = ''.join(
+	['\t\t\t\t<SETTING><NAME>SystemSearchPaths</NAME>\n'] +
+	[codewarriorSearchPathTemplate % {'path':path,'root':'SDKS','recursive':'false'} for path in ['windows\\perforce','windows\\opengl','windows\\directx9']] +
+	[codewarriorSearchPathTemplate % {'path':path,'root':'CodeWarrior','recursive':'true'} for path in ['MSL','Win32-x86 Support']] +
+	['\t\t\t\t</SETTING>\n'])
+
+# Compiler settings for the front end
+codewarriorFrontEndSettings = (
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_cplusplus</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_templateparser</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_instance_manager</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_enableexceptions</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_useRTTI</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_booltruefalse</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_wchar_type</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_ecplusplus</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_dontinline</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_inlinelevel</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_autoinline</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_defer_codegen</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_bottomupinline</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_ansistrict</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_onlystdkeywords</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_trigraphs</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_arm</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_checkprotos</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_c99</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_gcc_extensions</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_enumsalwaysint</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_unsignedchars</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_poolstrings</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWFrontEnd_C_dontreusestrings</NAME><VALUE>0</VALUE></SETTING>\n')
+
+# Preprocessor settings after the prefix text
+codewarriorPreprocessorSettings = (
+	'</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_MultiByteEncoding</NAME><VALUE>encASCII_Unicode</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_PCHUsesPrefixText</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_EmitPragmas</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_KeepWhiteSpace</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_EmitFullPath</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_KeepComments</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_EmitFile</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_EmitLine</NAME><VALUE>false</VALUE></SETTING>\n')
+
+# Warnings panel
+codewarriorWarningSettings = (
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_illpragma</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_possunwant</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_pedantic</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_illtokenpasting</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_hidevirtual</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_implicitconv</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_impl_f2i_conv</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_impl_s2u_conv</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_impl_i2f_conv</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_ptrintconv</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_unusedvar</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_unusedarg</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_resultnotused</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_missingreturn</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_no_side_effect</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_extracomma</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_structclass</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_emptydecl</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_filenamecaps</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_filenamecapssystem</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_padding</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_undefmacro</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warn_notinlined</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWWarning_C_warningerrors</NAME><VALUE>0</VALUE></SETTING>\n')
+
+# X86 code generation and global optimizations, the Debug
+# target turns the optimizer off
+codewarriorCodeGenTemplate = (
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_runtime</NAME><VALUE>Custom</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_processor</NAME><VALUE>PentiumIV</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_use_extinst</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_extinst_mmx</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_extinst_3dnow</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_extinst_cmov</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_extinst_sse</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_extinst_sse2</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_use_mmx_3dnow_convention</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_vectorize</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_profile</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_readonlystrings</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_alignment</NAME><VALUE>bytes8</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_intrinsics</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_optimizeasm</NAME><VALUE>%(optimizeasm)s</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_disableopts</NAME><VALUE>%(disableopts)s</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_relaxieee</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_exceptions</NAME><VALUE>ZeroOverhead</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWCodeGen_X86_name_mangling</NAME><VALUE>MWWin32</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>GlobalOptimizer_X86__optimizationlevel</NAME><VALUE>%(optimizationlevel)s</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>GlobalOptimizer_X86__optfor</NAME><VALUE>Size</VALUE></SETTING>\n')
+codewarriorCodeGenDebug = codewarriorCodeGenTemplate % {'optimizeasm':'0','disableopts':'1','optimizationlevel':'Level0'}
+codewarriorCodeGenRelease = codewarriorCodeGenTemplate % {'optimizeasm':'1','disableopts':'0','optimizationlevel':'Level4'}
+
+# x86 disassembler
+codewarriorDisassemblerSettings = (
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showHeaders</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showSectHeaders</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showSymTab</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showCode</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showData</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showDebug</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showExceptions</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showRelocation</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showRaw</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showAllRaw</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showSource</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showHex</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showComments</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_resolveLocals</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_resolveRelocs</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_showSymDefs</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_unmangle</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>PDisasmX86_verbose</NAME><VALUE>false</VALUE></SETTING>\n')
+
+# x86 linker settings
+codewarriorLinkerSettings = (
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_linksym</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_linkCV</NAME><VALUE>1</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_symfullpath</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_linkdebug</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_debuginline</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_subsystem</NAME><VALUE>Unknown</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_entrypointusage</NAME><VALUE>Default</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_entrypoint</NAME><VALUE></VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_codefolding</NAME><VALUE>Any</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_usedefaultlibs</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_adddefaultlibs</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_mergedata</NAME><VALUE>true</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_zero_init_bss</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_generatemap</NAME><VALUE>0</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_checksum</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_linkformem</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_nowarnings</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_verbose</NAME><VALUE>false</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWLinker_X86_commandfile</NAME><VALUE></VALUE></SETTING>\n')
+
+#
+# The XML header, the start of the project and target list
+# and the Everything target, up to its list of subtargets
+#
+
+codewarriorProjectHeader = (
+	'<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>\n'
+	'<?codewarrior exportversion="1.0.1" ideversion="5.0" ?>\n'
+	'<PROJECT>\n'
+	'\t<TARGETLIST>\n'
+	'\t\t<TARGET>\n'
+	'\t\t\t<NAME>Everything</NAME>\n'
+	'\t\t\t<SETTINGLIST>\n'
+	'\t\t\t\t<SETTING><NAME>Linker</NAME><VALUE>None</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>Targetname</NAME><VALUE>Everything</VALUE></SETTING>\n'
+	'\t\t\t</SETTINGLIST>\n'
+	'\t\t\t<FILELIST>\n'
+	'\t\t\t</FILELIST>\n'
+	'\t\t\t<LINKORDER>\n'
+	'\t\t\t</LINKORDER>\n')
+
+#
+# The start of each target and its settings list,
+# the fixed settings blocks are merged in at load time
+#
+
+codewarriorTargetTemplate = (
+	'\t\t<TARGET>\n'
+	'\t\t\t<NAME>%(targetname)s</NAME>\n'
+	'\t\t\t<SETTINGLIST>\n'
+	'\t\t\t\t<SETTING><NAME>Linker</NAME><VALUE>Win32 x86 Linker</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>Targetname</NAME><VALUE>%(targetname)s</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>OutputDirectory</NAME>\n'
+	'\t\t\t\t\t<SETTING><NAME>Path</NAME><VALUE>bin</VALUE></SETTING>\n'
+	'\t\t\t\t\t<SETTING><NAME>PathFormat</NAME><VALUE>Windows</VALUE></SETTING>\n'
+	'\t\t\t\t\t<SETTING><NAME>PathRoot</NAME><VALUE>Project</VALUE></SETTING>\n'
+	'\t\t\t\t</SETTING>\n'
+	'%(usersearchpaths)s' +
+	codewarriorSystemSearchPaths.replace('%','%%') +
+	'\t\t\t\t<SETTING><NAME>MWProject_X86_type</NAME><VALUE>%(projecttype)s</VALUE></SETTING>\n'
+	'\t\t\t\t<SETTING><NAME>MWProject_X86_outfile</NAME><VALUE>%(outfile)s</VALUE></SETTING>\n' +
+	codewarriorFrontEndSettings.replace('%','%%') +
+	'\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_PrefixText</NAME><VALUE>%(prefixtext)s' +
+	codewarriorPreprocessorSettings.replace('%','%%') +
+	codewarriorWarningSettings.replace('%','%%') +
+	'%(codegen)s' +
+	codewarriorDisassemblerSettings.replace('%','%%') +
+	codewarriorLinkerSettings.replace('%','%%') +
+	'\t\t\t</SETTINGLIST>\n')
+
 #
 # Create a codewarrior 9.4 project
 #
@@ -1950,333 +2124,134 @@ def createcodewarriorsolution(solution):
 	# Save out the filenames
 	#
 	
-	listh = pickfromfilelist(codefiles,'h')
-	listcpp = pickfromfilelist(codefiles,'cpp')
+	buckets = bucketfilelist(codefiles)
+	listh = buckets.get('h',[])
+	listcpp = buckets.get('cpp',[])
 	listwindowsresource = []
 	if platformcode=='win':
-		listwindowsresource = pickfromfilelist(codefiles,'windowsresource')
+		listwindowsresource = buckets.get('windowsresource',[])
 	
 	alllists = listh + listcpp + listwindowsresource
 
-	fp = open(projectpathname,'w')
-	
 	#
-	# Save the standard XML header for CodeWarrior
+	# Target names use Win32, output file names w32
 	#
 	
-	fp.write('<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>\n')
-	fp.write('<?codewarrior exportversion="1.0.1" ideversion="5.0" ?>\n')
+	if solution.platform=='windows':
+		targetplatform = 'Win32'
+		outputplatform = 'w32'
+	else:
+		targetplatform = solution.platform
+		outputplatform = solution.platform
+	targetnames = [f'{targetplatform} {target}' for target in solution.configurations]
 
+	output = []
+	
 	#
-	# Begin the project object
+	# Save the standard XML header for CodeWarrior and begin
+	# the target list with a fake project that will build all
+	# of the other projects
 	#
 	
-	fp.write('<PROJECT>\n')
+	output.append(codewarriorProjectHeader)
+	if len(targetnames)!=0:
+		output.append('\t\t\t<SUBTARGETLIST>\n')
+		output.append(''.join([f'\t\t\t\t<SUBTARGET>\n\t\t\t\t\t<TARGETNAME>{targetname}</TARGETNAME>\n\t\t\t\t</SUBTARGET>\n' for targetname in targetnames]))
+		output.append('\t\t\t</SUBTARGETLIST>\n')
+	output.append('\t\t</TARGET>\n')
 
 	#
-	# Create all of the project targets
+	# Output each target
 	#
 	
-	fp.write('\t<TARGETLIST>\n')
-		
 	#
-	# Begin with a fake project that will build all of the other projects
-	#
-	
-	fp.write('\t\t<TARGET>\n')
-	fp.write('\t\t\t<NAME>Everything</NAME>\n')
-	fp.write('\t\t\t<SETTINGLIST>\n')
-	fp.write('\t\t\t\t<SETTING><NAME>Linker</NAME><VALUE>None</VALUE></SETTING>\n')
-	fp.write('\t\t\t\t<SETTING><NAME>Targetname</NAME><VALUE>Everything</VALUE></SETTING>\n')
-	fp.write('\t\t\t</SETTINGLIST>\n')
-	fp.write('\t\t\t<FILELIST>\n')
-	fp.write('\t\t\t</FILELIST>\n')
-	fp.write('\t\t\t<LINKORDER>\n')
-	fp.write('\t\t\t</LINKORDER>\n')
-	if len(solution.configurations)!=0:
-		fp.write('\t\t\t<SUBTARGETLIST>\n')
-		for target in solution.configurations:
-			if solution.platform=='windows':
-				platformcode2 = 'Win32'
-			else:
-				platformcode2 = solution.platform
-			fp.write('\t\t\t\t<SUBTARGET>\n')
-			fp.write('\t\t\t\t\t<TARGETNAME>' + platformcode2 + ' ' + target + '</TARGETNAME>\n')	
-			fp.write('\t\t\t\t</SUBTARGET>\n')
-		fp.write('\t\t\t</SUBTARGETLIST>\n')
-	fp.write('\t\t</TARGET>\n')
+	# User include folders are the same for every target
+	#
+	
+	if len(includedirectories)!=0:
+		usersearchpaths = ''.join(
+			['\t\t\t\t<SETTING><NAME>UserSearchPaths</NAME>\n'] +
+			[codewarriorSearchPathTemplate % {'path':converttowindowsslashes(dirnameentry),'root':'Project','recursive':'false'} for dirnameentry in includedirectories] +
+			['\t\t\t\t</SETTING>\n'])
+	else:
+		usersearchpaths = ''
 
 	#
-	# Output each target
+	# Library/Application?
 	#
 	
-	for target in solution.configurations:
-	
-		# Create the target name
-		
-		if solution.platform=='windows':
-			platformcode2 = 'Win32'
-		else:
-			platformcode2 = solution.platform
-		fp.write('\t\t<TARGET>\n')
-		fp.write('\t\t\t<NAME>' + platformcode2 + ' ' + target + '</NAME>\n')	
-		
-		#
-		# Store the settings for the target
-		#
-		
-		fp.write('\t\t\t<SETTINGLIST>\n')
-		
-		#
-		# Choose the target platform via the linker
-		#
-		
-		fp.write('\t\t\t\t<SETTING><NAME>Linker</NAME><VALUE>Win32 x86 Linker</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>Targetname</NAME><VALUE>' + platformcode2 + ' ' + target + '</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>OutputDirectory</NAME>\n')
-		fp.write('\t\t\t\t\t<SETTING><NAME>Path</NAME><VALUE>bin</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t\t<SETTING><NAME>PathFormat</NAME><VALUE>Windows</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t\t<SETTING><NAME>PathRoot</NAME><VALUE>Project</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t</SETTING>\n')
-		
-		#
-		# User include folders
-		#
-		
-		if len(includedirectories)!=0:
-			fp.write('\t\t\t\t<SETTING><NAME>UserSearchPaths</NAME>\n')
-			for dirnameentry in includedirectories:
-				fp.write('\t\t\t\t\t<SETTING>\n')
-				fp.write('\t\t\t\t\t\t<SETTING><NAME>SearchPath</NAME>\n')
-				fp.write('\t\t\t\t\t\t\t<SETTING><NAME>Path</NAME><VALUE>' + converttowindowsslashes(dirnameentry) + '</VALUE></SETTING>\n')
-				fp.write('\t\t\t\t\t\t\t<SETTING><NAME>PathFormat</NAME><VALUE>Windows</VALUE></SETTING>\n')
-				fp.write('\t\t\t\t\t\t\t<SETTING><NAME>PathRoot</NAME><VALUE>Project</VALUE></SETTING>\n')
-				fp.write('\t\t\t\t\t\t</SETTING>\n')
-				fp.write('\t\t\t\t\t\t<SETTING><NAME>Recursive</NAME><VALUE>false</VALUE></SETTING>\n')
-				fp.write('\t\t\t\t\t\t<SETTING><NAME>FrameworkPath</NAME><VALUE>false</VALUE></SETTING>\n')
-				fp.write('\t\t\t\t\t\t<SETTING><NAME>HostFlags</NAME><VALUE>All</VALUE></SETTING>\n')
-				fp.write('\t\t\t\t\t</SETTING>\n')
-			fp.write('\t\t\t\t</SETTING>\n')
+	if solution.kind=='library':
+		projecttype = 'Library'
+		outputextension = '.lib'
+	else:
+		projecttype = 'Application'
+		outputextension = '.exe'
 
-		#
-		# Operating system include folders
-		#
-		
-		fp.write('\t\t\t\t<SETTING><NAME>SystemSearchPaths</NAME>\n')
-		for dirnameentry in ['windows\perforce','windows\opengl','windows\directx9']:
-			fp.write('\t\t\t\t\t<SETTING>\n')
-			fp.write('\t\t\t\t\t\t<SETTING><NAME>SearchPath</NAME>\n')
-			fp.write('\t\t\t\t\t\t\t<SETTING><NAME>Path</NAME><VALUE>' + dirnameentry + '</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t\t\t<SETTING><NAME>PathFormat</NAME><VALUE>Windows</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t\t\t<SETTING><NAME>PathRoot</NAME><VALUE>SDKS</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t\t</SETTING>\n')
-			fp.write('\t\t\t\t\t\t<SETTING><NAME>Recursive</NAME><VALUE>false</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t\t<SETTING><NAME>FrameworkPath</NAME><VALUE>false</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t\t<SETTING><NAME>HostFlags</NAME><VALUE>All</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t</SETTING>\n')
-
-		for dirnameentry in ['MSL','Win32-x86 Support']:
-			fp.write('\t\t\t\t\t<SETTING>\n')
-			fp.write('\t\t\t\t\t\t<SETTING><NAME>SearchPath</NAME>\n')
-			fp.write('\t\t\t\t\t\t\t<SETTING><NAME>Path</NAME><VALUE>' + dirnameentry + '</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t\t\t<SETTING><NAME>PathFormat</NAME><VALUE>Windows</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t\t\t<SETTING><NAME>PathRoot</NAME><VALUE>CodeWarrior</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t\t</SETTING>\n')
-			fp.write('\t\t\t\t\t\t<SETTING><NAME>Recursive</NAME><VALUE>true</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t\t<SETTING><NAME>FrameworkPath</NAME><VALUE>false</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t\t<SETTING><NAME>HostFlags</NAME><VALUE>All</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t\t</SETTING>\n')
-
-		fp.write('\t\t\t\t</SETTING>\n')
+	# Output file name, only the configuration code changes per target
+	outputbase = f'{solution.projectname}{idecode}{outputplatform}'
 
-		#
-		# Library/Application?
-		#
-		
-		if solution.platform=='windows':
-			platformcode2 = 'w32'
-		else:
-			platformcode2 = solution.platform
-		if solution.kind=='library':
-			fp.write('\t\t\t\t<SETTING><NAME>MWProject_X86_type</NAME><VALUE>Library</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t<SETTING><NAME>MWProject_X86_outfile</NAME><VALUE>' + solution.projectname + idecode + platformcode2 + getconfigurationcode(target) + '.lib</VALUE></SETTING>\n')
-		else:
-			fp.write('\t\t\t\t<SETTING><NAME>MWProject_X86_type</NAME><VALUE>Application</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t<SETTING><NAME>MWProject_X86_outfile</NAME><VALUE>' + solution.projectname + idecode + platformcode2 + getconfigurationcode(target) + '.exe</VALUE></SETTING>\n')
+	#
+	# Preprocessor defines after the NDEBUG/_DEBUG one
+	#
+	
+	defines = []
+	if outputplatform=='w32':
+		defines.append('#define WIN32_LEAN_AND_MEAN\n#define WIN32\n')
+	for defineentry in solution.defines:
+		defines.append(f'#define {defineentry}\n')
+	defines = ''.join(defines)
 
-		#
-		# Compiler settings for the front end
-		#
-		
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_cplusplus</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_templateparser</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_instance_manager</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_enableexceptions</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_useRTTI</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_booltruefalse</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_wchar_type</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_ecplusplus</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_dontinline</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_inlinelevel</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_autoinline</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_defer_codegen</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_bottomupinline</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_ansistrict</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_onlystdkeywords</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_trigraphs</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_arm</NAME><VALUE>0</VALUE></SETTING>\n')		
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_checkprotos</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_c99</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_gcc_extensions</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_enumsalwaysint</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_unsignedchars</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_poolstrings</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWFrontEnd_C_dontreusestrings</NAME><VALUE>0</VALUE></SETTING>\n')
+	#
+	# The file names without the directories, sorted, are
+	# the same for every target
+	#
+	
+	filelist = sorted([ntpath.basename(item.winname) for item in alllists])
 
-		#
-		# Preprocessor settings
-		#
-		
-		fp.write('\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_PrefixText</NAME><VALUE>#define ')
-		if target=='Release':
-			fp.write('NDEBUG\n')
+	#
+	# So are their FILELIST and LINKORDER entries, only the
+	# FILEFLAGS of the source files change with the target
+	#
+	
+	textfilesdebug = []
+	textfilesrelease = []
+	for i in filelist:
+		release = codewarriorFileTemplate % {'path':i,'kind':'Text','flags':''}
+		textfilesrelease.append(release)
+		# Only source files are flagged for debugging
+		if i.endswith(('.c','.cpp')):
+			textfilesdebug.append(codewarriorFileTemplate % {'path':i,'kind':'Text','flags':'Debug'})
 		else:
-			fp.write('_DEBUG\n')
-		if platformcode2=='w32':
-			fp.write('#define WIN32_LEAN_AND_MEAN\n#define WIN32\n')
-		for defineentry in solution.defines:
-			fp.write('#define ' + defineentry + '\n')
-		fp.write('</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_MultiByteEncoding</NAME><VALUE>encASCII_Unicode</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_PCHUsesPrefixText</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_EmitPragmas</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_KeepWhiteSpace</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_EmitFullPath</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_KeepComments</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_EmitFile</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>C_CPP_Preprocessor_EmitLine</NAME><VALUE>false</VALUE></SETTING>\n')
+			textfilesdebug.append(release)
+	textfilesdebug = ''.join(textfilesdebug)
+	textfilesrelease = ''.join(textfilesrelease)
+	textfilerefs = ''.join([codewarriorFileRefTemplate % i for i in filelist])
 
+	#
+	# Output each target
+	#
+	
+	for target,targetname in zip(solution.configurations,targetnames):
+	
 		#
-		# Warnings panel
+		# Store the settings for the target
 		#
-		
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_illpragma</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_possunwant</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_pedantic</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_illtokenpasting</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_hidevirtual</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_implicitconv</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_impl_f2i_conv</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_impl_s2u_conv</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_impl_i2f_conv</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_ptrintconv</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_unusedvar</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_unusedarg</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_resultnotused</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_missingreturn</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_no_side_effect</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_extracomma</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_structclass</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_emptydecl</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_filenamecaps</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_filenamecapssystem</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_padding</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_undefmacro</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warn_notinlined</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWWarning_C_warningerrors</NAME><VALUE>0</VALUE></SETTING>\n')
 
-		#
-		# X86 code gen
-		#
-		
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_runtime</NAME><VALUE>Custom</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_processor</NAME><VALUE>PentiumIV</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_use_extinst</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_extinst_mmx</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_extinst_3dnow</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_extinst_cmov</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_extinst_sse</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_extinst_sse2</NAME><VALUE>0</VALUE></SETTING>\n')
-
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_use_mmx_3dnow_convention</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_vectorize</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_profile</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_readonlystrings</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_alignment</NAME><VALUE>bytes8</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_intrinsics</NAME><VALUE>1</VALUE></SETTING>\n')
-		if target=='Debug':
-			fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_optimizeasm</NAME><VALUE>0</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_disableopts</NAME><VALUE>1</VALUE></SETTING>\n')
+		if target=='Release':
+			debugdefine = 'NDEBUG'
 		else:
-			fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_optimizeasm</NAME><VALUE>1</VALUE></SETTING>\n')
-			fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_disableopts</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_relaxieee</NAME><VALUE>1</VALUE></SETTING>\n')
-
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_exceptions</NAME><VALUE>ZeroOverhead</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWCodeGen_X86_name_mangling</NAME><VALUE>MWWin32</VALUE></SETTING>\n')
-		
-		#
-		# Global optimizations
-		#
-		
+			debugdefine = '_DEBUG'
 		if target=='Debug':
-			fp.write('\t\t\t\t<SETTING><NAME>GlobalOptimizer_X86__optimizationlevel</NAME><VALUE>Level0</VALUE></SETTING>\n')
+			codegen = codewarriorCodeGenDebug
 		else:
-			fp.write('\t\t\t\t<SETTING><NAME>GlobalOptimizer_X86__optimizationlevel</NAME><VALUE>Level4</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>GlobalOptimizer_X86__optfor</NAME><VALUE>Size</VALUE></SETTING>\n')
-
-		#
-		# x86 disassembler
-		#
-		
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showHeaders</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showSectHeaders</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showSymTab</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showCode</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showData</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showDebug</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showExceptions</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showRelocation</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showRaw</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showAllRaw</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showSource</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showHex</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showComments</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_resolveLocals</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_resolveRelocs</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_showSymDefs</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_unmangle</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>PDisasmX86_verbose</NAME><VALUE>false</VALUE></SETTING>\n')
-
-		#
-		# x86 linker settings
-		#
-
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_linksym</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_linkCV</NAME><VALUE>1</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_symfullpath</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_linkdebug</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_debuginline</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_subsystem</NAME><VALUE>Unknown</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_entrypointusage</NAME><VALUE>Default</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_entrypoint</NAME><VALUE></VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_codefolding</NAME><VALUE>Any</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_usedefaultlibs</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_adddefaultlibs</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_mergedata</NAME><VALUE>true</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_zero_init_bss</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_generatemap</NAME><VALUE>0</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_checksum</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_linkformem</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_nowarnings</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_verbose</NAME><VALUE>false</VALUE></SETTING>\n')
-		fp.write('\t\t\t\t<SETTING><NAME>MWLinker_X86_commandfile</NAME><VALUE></VALUE></SETTING>\n')
-
-		#
-		# Settings are done
-		#
-		
-		fp.write('\t\t\t</SETTINGLIST>\n')
+			codegen = codewarriorCodeGenRelease
+		output.append(codewarriorTargetTemplate % {
+			'targetname':targetname,
+			'usersearchpaths':usersearchpaths,
+			'projecttype':projecttype,
+			'outfile':f'{outputbase}{getconfigurationcode(target)}{outputextension}',
+			'prefixtext':f'#define {debugdefine}\n{defines}',
+			'codegen':codegen})
 		
 		#
 		# Add in the list of files
@@ -2290,78 +2265,40 @@ def createcodewarriorsolution(solution):
 
 		if len(alllists)!=0:
 			
-			fp.write('\t\t\t<FILELIST>\n')
+			if target!='Release':
+				flags = 'Debug'
+				textfiles = textfilesdebug
+			else:
+				flags = ''
+				textfiles = textfilesrelease
+			output.append('\t\t\t<FILELIST>\n')
 			if solution.kind!='library':
-				for i in liblist:
-					fp.write('\t\t\t\t<FILE>\n')
-					fp.write('\t\t\t\t\t<PATHTYPE>Name</PATHTYPE>\n')
-					fp.write('\t\t\t\t\t<PATH>' + i + '</PATH>\n')
-					fp.write('\t\t\t\t\t<PATHFORMAT>Windows</PATHFORMAT>\n')
-					fp.write('\t\t\t\t\t<FILEKIND>Library</FILEKIND>\n')
-					if target!='Release': 
-						fp.write('\t\t\t\t\t<FILEFLAGS>Debug</FILEFLAGS>\n')
-					else:
-						fp.write('\t\t\t\t\t<FILEFLAGS></FILEFLAGS>\n')
-					fp.write('\t\t\t\t</FILE>\n')
-				
-			filelist = []
-			for i in alllists:
-				parts = converttowindowsslashes(i.filename).split('\\')
-				filelist.append(parts[len(parts)-1])
-		
-			filelist = sorted(filelist,cmp=lambda x,y: cmp(x,y))
-
-			for i in filelist:
-				fp.write('\t\t\t\t<FILE>\n')
-				fp.write('\t\t\t\t\t<PATHTYPE>Name</PATHTYPE>\n')
-				fp.write('\t\t\t\t\t<PATH>' + i + '</PATH>\n')
-				fp.write('\t\t\t\t\t<PATHFORMAT>Windows</PATHFORMAT>\n')
-				fp.write('\t\t\t\t\t<FILEKIND>Text</FILEKIND>\n')
-				if target!='Release' and (i.endswith('.c') or i.endswith('.cpp')): 
-					fp.write('\t\t\t\t\t<FILEFLAGS>Debug</FILEFLAGS>\n')
-				else:
-					fp.write('\t\t\t\t\t<FILEFLAGS></FILEFLAGS>\n')
-				fp.write('\t\t\t\t</FILE>\n')
-			
-			fp.write('\t\t\t</FILELIST>\n')
+				output.append(''.join([codewarriorFileTemplate % {'path':i,'kind':'Library','flags':flags} for i in liblist]))
+			output.append(textfiles)
+			output.append('\t\t\t</FILELIST>\n')
 		
-			fp.write('\t\t\t<LINKORDER>\n')
+			output.append('\t\t\t<LINKORDER>\n')
 			if solution.kind!='library':
-				for i in liblist:
-					fp.write('\t\t\t\t<FILEREF>\n')
-					fp.write('\t\t\t\t\t<PATHTYPE>Name</PATHTYPE>\n')
-					fp.write('\t\t\t\t\t<PATH>' + i + '</PATH>\n')
-					fp.write('\t\t\t\t\t<PATHFORMAT>Windows</PATHFORMAT>\n')
-					fp.write('\t\t\t\t</FILEREF>\n')
-			for i in filelist:
-				fp.write('\t\t\t\t<FILEREF>\n')
-				fp.write('\t\t\t\t\t<PATHTYPE>Name</PATHTYPE>\n')
-				fp.write('\t\t\t\t\t<PATH>' + i + '</PATH>\n')
-				fp.write('\t\t\t\t\t<PATHFORMAT>Windows</PATHFORMAT>\n')
-				fp.write('\t\t\t\t</FILEREF>\n')
-			fp.write('\t\t\t</LINKORDER>\n')
+				output.append(''.join([codewarriorFileRefTemplate % i for i in liblist]))
+			output.append(textfilerefs)
+			output.append('\t\t\t</LINKORDER>\n')
 		
-		fp.write('\t\t</TARGET>\n')
+		output.append('\t\t</TARGET>\n')
 
 	#
 	# All of the targets are saved
 	#
 	
-	fp.write('\t</TARGETLIST>\n')
+	output.append('\t</TARGETLIST>\n')
 	
 	#
 	# Now output the list of targets
 	#
 	
-	fp.write('\t<TARGETORDER>\n')
-	fp.write('\t\t<ORDEREDTARGET><NAME>Everything</NAME></ORDEREDTARGET>\n')
-	for target in solution.configurations:
-		if solution.platform=='windows':
-			platformcode2 = 'Win32'
-		else:
-			platformcode2 = solution.platform
-		fp.write('\t\t<ORDEREDTARGET><NAME>' + platformcode2 + ' ' + target + '</NAME></ORDEREDTARGET>\n')
-	fp.write('\t</TARGETORDER>\n')
+	output.append('\t<TARGETORDER>\n')
+	output.append('\t\t<ORDEREDTARGET><NAME>Everything</NAME></ORDEREDTARGET>\n')
+	output.append(''.join([f'\t\t<ORDEREDTARGET><NAME>{targetname}</NAME></ORDEREDTARGET>\n' for targetname in targetnames]))
+	output.append('\t</TARGETORDER>\n')
 
 	#
 	# Save the file list as they are displayed in the IDE
@@ -2371,72 +2308,46 @@ def createcodewarriorsolution(solution):
 
 		#	
 		# Create groups first since CodeWarrior uses a nested tree structure
-		# for file groupings
+		# for file groupings. The recursive tree for the file list is
+		# built in the same pass, the first time each group is seen
 		#
 		
 		groups = dict()
+		tree = dict()
 		for item in alllists:
-			groupname = converttowindowsslashes(extractgroupname(item.filename))
 			# Put each filename in its proper group
-			if groupname in groups:
-				groups[groupname].append(converttowindowsslashes(item.filename))
-			else:
-				# New group!
-				groups[groupname] = [converttowindowsslashes(item.filename)]
-		
-		#
-		# Create a recursive tree in order to store out the file list
-		#
+			group = groups.get(item.groupname)
+			if group==None:
+				group = groups[item.groupname] = []
+				next = tree
+				#
+				# Iterate over every part, stepping into the tree
+				#
+				for part in item.groupname.split('\\'):
+					next = next.setdefault(part,dict())
+			group.append(item.winname)
 
-		fp.write('\t<GROUPLIST>\n')
-		tree = dict()
-		for group in groups:
-			#
-			# Get the depth of the tree needed
-			#
-			
-			parts = group.split('\\')
-			next = tree
-			#
-			# Iterate over every part
-			#
-			for x in xrange(len(parts)):
-				# Already declared?
-				if not parts[x] in next:
-					next[parts[x]] = dict()
-				# Step into the tree
-				next = next[parts[x]]
+		output.append('\t<GROUPLIST>\n')
 
 		# Use this tree to play back all the data
-		dumptreecodewarrior(2,'',tree,fp,groups)
+		dumptreecodewarrior(2,'',tree,output,groups)
 		
 		if solution.kind!='library':
 			liblist = ['user32.lib','kernel32.lib','MSL_All_x86.lib']
-			fp.write('\t\t<GROUP><NAME>Libraries</NAME>\n')
-			for i in liblist:
-				fp.write('\t\t\t<FILEREF>\n')
-				fp.write('\t\t\t\t<TARGETNAME>Win32 Release</TARGETNAME>\n')
-				fp.write('\t\t\t\t<PATHTYPE>Name</PATHTYPE>\n')
-				fp.write('\t\t\t\t<PATH>' + i + '</PATH>\n')
-				fp.write('\t\t\t\t<PATHFORMAT>Windows</PATHFORMAT>\n')
-				fp.write('\t\t\t</FILEREF>\n')
-
-			fp.write('\t\t\t<FILEREF>\n')
-			fp.write('\t\t\t\t<TARGETNAME>Win32 Debug</TARGETNAME>\n')
-			fp.write('\t\t\t\t<PATHTYPE>Name</PATHTYPE>\n')
-			fp.write('\t\t\t\t<PATH>MSL_All_x86_D.lib</PATH>\n')
-			fp.write('\t\t\t\t<PATHFORMAT>Windows</PATHFORMAT>\n')
-			fp.write('\t\t\t</FILEREF>\n')
-			fp.write('\t\t</GROUP>\n')
+			output.append('\t\t<GROUP><NAME>Libraries</NAME>\n')
+			output.append(''.join([codewarriorGroupFileRefTemplate % {'tabs':'\t\t\t','target':'Release','path':i} for i in liblist]))
+			output.append(codewarriorGroupFileRefTemplate % {'tabs':'\t\t\t','target':'Debug','path':'MSL_All_x86_D.lib'})
+			output.append('\t\t</GROUP>\n')
 	
-		fp.write('\t</GROUPLIST>\n')
+		output.append('\t</GROUPLIST>\n')
+
+	output.append('</PROJECT>\n')
 
 	#
-	# Close the file
+	# Save the project in one pass as UTF-8
 	#
 	
-	fp.write('</PROJECT>\n')
-	fp.close()
+	savefile(projectpathname,output)
 	
 	#
 	# If codewarrior is installed, create the MCP file
@@ -2445,11 +2356,40 @@ def createcodewarriorsolution(solution):
 	cwfile = os.getenv('CWFolder')
 	if cwfile!=None and solution.platform=='windows':
 		cwfile = os.path.join(cwfile,'Bin','ide')
-		cmd = '"' + cwfile + '" /x "' + projectpathname + '" "' + os.path.join(solution.workingDir,projectfilename + '.mcp') + '" /s /c /q'
+		mcppathname = os.path.join(solution.workingDir,projectfilename + '.mcp')
+
+		#
+		# The .mcp file is made only from the xml file, so if the
+		# hash of the xml matches the one saved with the last .mcp,
+		# skip the slow import
+		#
+
+		stamp = hashlib.blake2b(''.join(output).encode('utf-8')).hexdigest()
+		stamppathname = mcppathname + '.stamp'
+		if os.path.isfile(mcppathname) and os.path.isfile(stamppathname):
+			fp = open(stamppathname,'r',encoding='utf-8')
+			oldstamp = fp.read()
+			fp.close()
+			if oldstamp==stamp:
+				os.remove(projectpathname)
+				return 0
+
+		#
+		# Remove the old stamp first, so a failed import can't leave
+		# a stamp that matches a project that was never rebuilt
+		#
+
+		try:
+			os.remove(stamppathname)
+		except FileNotFoundError:
+			pass
 		sys.stdout.flush()
-		error = subprocess.call(cmd,cwd=os.path.dirname(projectpathname),shell=True)
+		error = subprocess.call([cwfile,'/x',projectpathname,mcppathname,'/s','/c','/q'],cwd=os.path.dirname(projectpathname))
 		if error==0:
 			os.remove(projectpathname)
+			fp = open(stamppathname,'w',encoding='utf-8')
+			fp.write(stamp)
+			fp.close()
 		return error
 		
 	return 0
@@ -2466,7 +2406,8 @@ def processsolution(myjson,solution):
 		if key=='kind' or \
 			key=='projectname' or \
 			key=='finalfolder' or \
-			key=='platform':
+			key=='platform' or \
+			key=='recursive':
 			setattr(solution,key,myjson[key])
 		elif key=='configurations' or \
 			key=='sourcefolders' or \
@@ -2475,11 +2416,35 @@ def processsolution(myjson,solution):
 			key=='includefolders':
 			setattr(solution,key,converttoarray(myjson[key]))
 		else:
-			print 'Unknown keyword "' + str(key) + '" with data "' + str(myjson[key]) + '" found in solution group'
+			print(f'Unknown keyword "{key}" with data "{myjson[key]}" found in solution group')
 			error = 1
 			continue
 	return solution,error
 
+#
+# Project generator for each ide and the
+# extra arguments it's called with
+#
+
+ideGenerators = {
+	'vs2010':(createvs2010solution,()),
+	'vs2008':(createvs2008solution,()),
+	'vs2005':(createvs2005solution,()),
+	'xcode3':(createxcodesolution,(3,)),
+	'xcode4':(createxcodesolution,(4,)),
+	'xcode5':(createxcodesolution,(5,)),
+	'codewarrior':(createcodewarriorsolution,())
+}
+
+#
+# Create the project for the ide in the solution,
+# may be run in a worker process
+#
+
+def createsolution(solution):
+	generator,extra = ideGenerators[solution.ide]
+	return generator(solution,*extra)
+
 #
 # The script is an array of objects containing solution settings
 # and a list of ides to output scripts
@@ -2487,35 +2452,42 @@ def processsolution(myjson,solution):
 
 def processeverything(myjsonlist,solution):
 	error = 0
+	jobs = dict()
 	for item in myjsonlist:
 		if type(item) is dict:
 			solution,error = processsolution(item,solution)
-		elif item=='vs2010':
-			solution.ide = item
-			error = createvs2010solution(solution)
-		elif item=='vs2008':
-			solution.ide = item
-			error = createvs2008solution(solution)
-		elif item=='vs2005':
+		elif type(item) is str and item in ideGenerators:
 			solution.ide = item
-			error = createvs2005solution(solution)
-		elif item=='xcode3':
-			solution.ide = item
-			error = createxcodesolution(solution,3)
-		elif item=='xcode4':
-			solution.ide = item
-			error = createxcodesolution(solution,4)
-		elif item=='xcode5':
-			solution.ide = item
-			error = createxcodesolution(solution,5)
-		elif item=='codewarrior':
-			solution.ide = item
-			error = createcodewarriorsolution(solution)
+			#
+			# Later entries change the settings, so save a copy for this project.
+			# Projects that write the same files only keep the last entry,
+			# so two workers never write the same file at once
+			#
+			key = (solution.workingDir,solution.projectname,getidecode(solution),solution.platform)
+			jobs.pop(key,None)
+			jobs[key] = copy.deepcopy(solution)
 		else:
-			print 'Saving ' + item + ' not implemented yet'
+			print(f'Saving {item} not implemented yet')
 			error = 0
 		if error!=0:
 			break
+
+	#
+	# Every other project writes its own files, so build them all at once.
+	# CodeWarrior projects share the one ide, so they are made one at a time
+	#
+
+	jobs = list(jobs.values())
+	workers = min(len([job for job in jobs if job.ide!='codewarrior']),os.cpu_count() or 1)
+	if workers>1:
+		with ProcessPoolExecutor(workers) as executor:
+			futures = [None if job.ide=='codewarrior' else executor.submit(createsolution,job) for job in jobs]
+			results = [createsolution(job) if future is None else future.result() for job,future in zip(jobs,futures)]
+	else:
+		results = [createsolution(job) for job in jobs]
+	for result in results:
+		if result!=0:
+			return result
 	return error
 
 #
@@ -2557,7 +2529,7 @@ def processdefault(solution,args):
 		myjsonlist.append('codewarrior')
 	
 	if len(myjsonlist)==0:
-		print 'No default "projects.json" file found nor any project type specified'
+		print('No default "projects.json" file found nor any project type specified')
 		return 2 
 	
 	#
@@ -2568,6 +2540,26 @@ def processdefault(solution,args):
 		solution.sourcefolders.append('source')
 	return processeverything(myjsonlist,solution)
 
+#
+# Parsed json files, by pathname and modification time
+# so a file given more than once is only parsed once
+#
+
+jsonFileCache = dict()
+
+def loadjsonfile(projectpathname):
+	key = (projectpathname,os.stat(projectpathname).st_mtime_ns)
+	myjson = jsonFileCache.get(key)
+	if myjson==None:
+		fp = open(projectpathname,'rb')
+		data = fp.read()
+		fp.close()
+		if data.startswith(codecs.BOM_UTF8):
+			data = data[len(codecs.BOM_UTF8):]
+		myjson = jsonloads(data)
+		jsonFileCache[key] = myjson
+	return myjson
+
 #
 # Command line shell
 #
@@ -2581,7 +2573,10 @@ def main():
 	
 	workingDir = os.getcwd()
 	
-	# Parse the command line
+	# Parse the command line, argparse is only needed here
+	# so worker processes that import this file skip it
+	
+	import argparse
 	
 	parser = argparse.ArgumentParser(
 		description='Create project files. Copyright by Rebecca Ann Heineman. Given a .json input file, create project files')
@@ -2645,19 +2640,15 @@ def main():
 	for input in args.jsonfiles:
 		projectpathname = os.path.join(workingDir,input)
 		if os.path.isfile(projectpathname)!=True:
-			print input + ' was not found'
+			print(f'{input} was not found')
 			return 2
 	
 	
-		fp = open(projectpathname,'r')
 		try:
-			myjson = json.load(fp)
+			myjson = loadjsonfile(projectpathname)
 		except Exception as e:
-			fp.close()
-			print str(e) + ' in parsing ' + projectpathname
+			print(f'{e} in parsing {projectpathname}')
 			return 2
-		
-		fp.close()
 
 		#
 		# Process the list of commands
@@ -2666,7 +2657,7 @@ def main():
 		if type(myjson) is list:
 			error = processeverything(myjson,solution)
 		else:
-			print 'Invalid json input file!'
+			print('Invalid json input file!')
 			error = 2
 		if error!=0:
 			break